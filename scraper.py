@@ -1,19 +1,15 @@
-from utils.database_handler import JsonRecordHandler
+from utils.database_handler import JsonRecordHandler, DataBaseHandler
 from github import RateLimitExceededException
 from utils.git_scraper import GitScraper
 from utils.pprints import PPrints
-from threading import Thread, Lock
-from os import path
-import subprocess
+from threading import Thread, Lock, Event, current_thread
+from traceback import format_exc
+from queue import Queue, Empty
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from os import cpu_count
 import signal
 import time
-import sys
-
-TEMP_EXE = """
-from {file_name} import Scraper
-obj = Scraper(number_of_threads={num_of_threads}, git_tokens={tokens_list})
-obj.start_scraper()
-"""
 
 
 class Scraper(object):
@@ -28,26 +24,37 @@ class Scraper(object):
         width_for_wrap (int): The width used for wrapping docstrings.
         verbose (bool): Whether to print verbose status messages.
         use_threads (bool): Whether to use multiple threads for scraping.
-        number_of_threads (int): The number of threads to use for scraping.
+        number_of_threads (int): The number of threads to use for scraping; sized from the number of tokens if None.
         data_base_path (str): The path where the SQLite database will be stored.
         data_base_file_name (str): The name of the SQLite database file.
+        rate_limit_threshold (int): Remaining core requests at or below which a token is considered exhausted.
+        parse_processes (int): The number of processes parsing the downloaded files; 0 parses in the worker threads.
+        fetch_threads (int): The number of threads downloading files, shared by all workers; 0 downloads in the
+                             worker threads.
 
     Methods:
         _create_instance(): Creates and returns a GitScraper instance.
+        _next_token(token, remaining, reset_time): Records a token's rate-limit state and picks the next token.
+        _database_writer(): Drains the insert queue and commits rows in batches of db_commit_index.
+        _handle_pager(scraper_instance): Runs the thread paging search results into the repository queue.
+        _handle_threads(scraper_instance): Runs a worker thread scraping repositories from the repository queue.
         start_scraper(): Initiates the scraping process with or without multiple threads.
     """
 
     def __init__(self,
                  search_query: str = "language:python pushed:<2023-01-01",
                  git_tokens: list = None,
-                 id_record_file: str = "ids.json",
+                 id_record_file: str = "ids.jsonl",
                  db_commit_index: int = 1500,
                  width_for_wrap: int = 70,
                  verbose: bool = True,
                  use_threads: bool = True,
-                 number_of_threads: int = 2,
+                 number_of_threads: int = None,
                  data_base_path: str = "./database",
                  data_base_file_name: str = "python_code_snippets.db",
+                 rate_limit_threshold: int = 10,
+                 parse_processes: int = None,
+                 fetch_threads: int = 16,
                  ) -> None:
 
         """
@@ -61,9 +68,17 @@ class Scraper(object):
             width_for_wrap (int): Width used for wrapping docstrings.
             verbose (bool): Whether to print verbose status messages.
             use_threads (bool): Whether to use multiple threads for scraping.
-            number_of_threads (int): The number of threads to use for scraping.
+            number_of_threads (int): The number of threads to use for scraping. Defaults to four per token
+                                     (at least 2, at most 64) since the work is I/O-bound.
             data_base_path (str): The path where the SQLite database will be stored.
             data_base_file_name (str): The name of the SQLite database file.
+            rate_limit_threshold (int): Remaining core requests at or below which a token is considered exhausted.
+            parse_processes (int): The number of processes parsing the downloaded files, since parsing is
+                                   CPU-bound and would hold the GIL of the worker threads. Defaults to the number
+                                   of CPUs; 0 parses in the worker threads instead.
+            fetch_threads (int): The number of threads downloading the files of the repositories being scraped,
+                                 shared by all workers so the downloads of a repository overlap. Defaults to 16;
+                                 0 downloads the files one by one in the worker threads.
 
         Returns:
             None
@@ -73,24 +88,62 @@ class Scraper(object):
         if git_tokens is None:
             git_tokens = []
         self._search_query: str = search_query
-        self._git_token: list = git_tokens
-        if not self._git_token:
-            self.re_execute_main_program()
+        self._git_token: list = list(git_tokens)
         self._id_records_file: str = id_record_file
         self._db_commit_index: int = db_commit_index
         self._wrap_width: int = width_for_wrap
         self._verbose: bool = verbose
         self._use_thread: bool = use_threads
+        if number_of_threads is None:
+            number_of_threads = max(2, min(len(self._git_token) * 4, 64))
+            if verbose:
+                print(f"[**] Using {number_of_threads} worker threads for {len(self._git_token)} token(s)")
         self._no_of_threads: int = number_of_threads
         self._data_base_path: str = data_base_path
         self._data_base_file_name: str = data_base_file_name
+        self._rate_limit_threshold: int = rate_limit_threshold
+        if parse_processes is None:
+            parse_processes = cpu_count() or 1
+        # Spawned rather than forked since threads are already running; the children ignore Ctrl+C and leave the
+        # shutdown to this process
+        self._parse_pool: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=parse_processes, mp_context=get_context("spawn"),
+            initializer=signal.signal, initargs=(signal.SIGINT, signal.SIG_IGN)) if parse_processes > 0 else None
+        self._fetch_threads: int = fetch_threads
+        self._fetch_pool: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=fetch_threads, thread_name_prefix="fetch") if fetch_threads > 0 else None
 
         # Script auto customizing
         self._threads_object_instances: list = []
-        self._running_threads: list[Thread] = []
+        self._running_threads: set[Thread] = set()
+        # Separate locks so ID bookkeeping and database writes never wait on each other (printing is queued and
+        # network requests run unlocked); _thread_lock only guards the worker and token bookkeeping of this class
         self._thread_lock = Lock()
-        self._json_handler = JsonRecordHandler(total_tokens=self._git_token, thread_lock=self._thread_lock)
-        self._pprints = PPrints(print_lock=self._thread_lock)
+        self._ids_lock = Lock()
+        self._db_lock = Lock()
+        self._worker_done = Event()
+        self._rate_limited = Event()
+        # Set when a worker died on an unexpected error rather than running out of repositories
+        self._worker_failed = Event()
+        # Shared by every GitScraper, workers read it between network calls to stop promptly
+        self._shutdown = Event()
+        self._seen_file_hashes: set[bytes] = set()
+        # IDs put on the repository queue by any pager; only recorded as scraped once a worker finished them
+        self._queued_ids: set[int] = set()
+        # token -> (remaining core requests, reset timestamp) as last reported by a worker
+        self._token_states: dict[str, tuple[int, float]] = {}
+        self._json_handler = JsonRecordHandler(total_tokens=self._git_token, thread_lock=self._ids_lock,
+                                               json_file_name=self._id_records_file,
+                                               flush_interval=self._db_commit_index)
+        self._pprints = PPrints()
+        # Pipeline: one pager thread -> repository queue -> worker threads -> insert queue -> one writer thread
+        # The queue carries raw repository data, each worker binds it to the client of its own token
+        self._repo_queue: Queue = Queue(maxsize=64)
+        self._pager_stop = Event()
+        # Every GitScraper pushes its parsed files here; a single writer thread owns the SQLite writes
+        self._insert_queue: Queue = Queue()
+        self._database_handler = DataBaseHandler(thread_lock=self._db_lock, data_base_path=self._data_base_path,
+                                                 data_base_file_name=self._data_base_file_name)
 
     def _create_instance(self) -> GitScraper:
         """
@@ -100,90 +153,245 @@ class Scraper(object):
             GitScraper: An instance of the GitScraper class.
         """
 
-        inst = GitScraper(json_handler=self._json_handler, thread_lock=self._thread_lock,
+        # Spread the tokens round-robin so every worker starts with its own rate-limit window
+        git_token = self._git_token[len(self._threads_object_instances) % len(self._git_token)]
+        inst = GitScraper(json_handler=self._json_handler, thread_lock=self._db_lock,
                           search_query=self._search_query,
                           id_record_file=self._id_records_file, db_commit_index=self._db_commit_index,
                           width_for_wrap=self._wrap_width, data_base_path=self._data_base_path,
                           data_base_file_name=self._data_base_file_name,
-                          pprints=self._pprints, verbose=self._verbose)
+                          pprints=self._pprints, verbose=self._verbose,
+                          git_token=git_token, token_provider=self._next_token,
+                          rate_limit_threshold=self._rate_limit_threshold, insert_queue=self._insert_queue,
+                          shutdown_event=self._shutdown, seen_file_hashes=self._seen_file_hashes,
+                          queued_ids=self._queued_ids, parse_pool=self._parse_pool, fetch_pool=self._fetch_pool,
+                          fetch_window=self._fetch_threads)
 
         self._threads_object_instances.append(inst)
         return inst
 
-    @staticmethod
-    def _handle_threads(scraper_instance):
+    def _next_token(self, token: str, remaining: int, reset_time: float) -> str:
+        """
+        Records the rate-limit state reported for a token and picks the token a worker should use next.
+
+        Args:
+            token (str): The token whose state is reported.
+            remaining (int): The remaining core requests of the token.
+            reset_time (float): The UNIX timestamp at which the token's rate limit resets.
+
+        Returns:
+            str: A token that still has requests left, or the one that resets first if all are exhausted.
+        """
+
+        with self._thread_lock:
+            self._token_states[token] = (remaining, reset_time)
+            now = time.time()
+            for candidate in self._git_token:
+                candidate_remaining, candidate_reset = self._token_states.get(candidate, (None, 0.0))
+                if candidate_remaining is None or candidate_remaining > self._rate_limit_threshold \
+                        or candidate_reset <= now:
+                    return candidate
+            return min(self._git_token, key=lambda candidate: self._token_states[candidate][1])
+
+    def _database_writer(self) -> None:
+        """
+        Drains the insert queue and commits the collected rows in a single transaction every
+        `db_commit_index` rows. A `None` item flushes the remaining rows and stops the writer.
+
+        The DataBaseHandler keeps its write connection open for the whole run so SQLite's statement cache
+        reuses the prepared INSERT statements across batches.
+        """
+
+        pending_rows = []
+        while True:
+            file_data = self._insert_queue.get()
+            if file_data is None:
+                break
+            doc_functions, doc_classes, source, file_content = file_data
+            pending_rows.extend(self._database_handler.build_rows(functions_data=doc_functions,
+                                                                  classes_data=doc_classes,
+                                                                  source=source, file_content=file_content))
+            if len(pending_rows) >= self._db_commit_index:
+                self._database_handler.insert_rows(pending_rows)
+                pending_rows = []
+        self._database_handler.insert_rows(pending_rows)
+        self._database_handler.close()
+
+    def _handle_pager(self, scraper_instance: GitScraper) -> None:
+        """
+        Runs the GitScraper instance paging through the search results into the repository queue.
+
+        The pager is not counted as a worker: once every worker is gone the supervisor sets `_pager_stop`
+        so a pager blocked on a full queue returns.
+
+        Args:
+            scraper_instance (GitScraper): The scraper instance to run.
+        """
+
         try:
-            scraper_instance.search_loop()
+            scraper_instance.produce_repos(repo_queue=self._repo_queue, consumers=self._no_of_threads,
+                                           stop_event=self._pager_stop)
         except RateLimitExceededException:
-            sys.exit()
+            self._rate_limited.set()
+        if scraper_instance.break_thread.is_set():
+            self._rate_limited.set()
+
+    def _reset_repo_queue(self) -> None:
+        """
+        Drops the leftover end-of-work markers from the repository queue while keeping the repositories that
+        were already queued, so the next batch of workers picks them up.
+        """
 
-    @staticmethod
-    def re_execute_main_program():
-        command = [sys.executable, path.join(path.dirname(__file__), "scraper.py")]
-        subprocess.run(command)
-        sys.exit()
+        leftover_repos = []
+        while True:
+            try:
+                repo = self._repo_queue.get_nowait()
+            except Empty:
+                break
+            if repo is not None:
+                leftover_repos.append(repo)
+        for repo in leftover_repos:
+            self._repo_queue.put(repo)
+
+    def _handle_threads(self, scraper_instance: GitScraper) -> None:
+        """
+        Runs a GitScraper instance scraping repositories from the repository queue inside a worker thread
+        and reports its termination.
+
+        The last worker to finish sets `_worker_done`, which wakes up the supervisor in `start_scraper`.
+        A worker stopped by the rate limit or a timeout (GitScraper sets its `break_thread` event when it hits
+        one) also sets `_rate_limited` so the supervisor knows the token has to be rotated, a worker that died on
+        any other error sets `_worker_failed` so it is not taken for the end of the search results.
+
+        Args:
+            scraper_instance (GitScraper): The scraper instance to run.
+        """
+
+        try:
+            scraper_instance.consume_repos(repo_queue=self._repo_queue)
+            if scraper_instance.break_thread.is_set():
+                self._rate_limited.set()
+        except RateLimitExceededException:
+            self._rate_limited.set()
+        except Exception:
+            print(f"[**] A worker stopped on an error: {format_exc()}")
+            self._worker_failed.set()
+        finally:
+            with self._thread_lock:
+                self._running_threads.discard(current_thread())
+                if not self._running_threads:
+                    self._worker_done.set()
 
     def start_scraper(self) -> None:
         """
         Initiates the scraping process with or without multiple threads.
 
         If multiple threads are used, a signal handler is set up to handle KeyboardInterrupt
-        (Ctrl+C) for graceful termination.
+        (Ctrl+C) for graceful termination. Whenever every worker has stopped because the current
+        token hit its rate limit, the token is dropped and a fresh batch of workers is started with
+        the next token in the same process. A batch in which a worker died on an error is restarted with the
+        same token, up to three times in a row.
+
+        The work runs as a pipeline: one pager thread puts unseen repositories on a bounded queue,
+        `number_of_threads` workers download and parse them, and a single database writer thread
+        commits the parsed files in batches of `db_commit_index` rows.
 
         Returns:
             None
         """
 
-        if self._use_thread:
-            try:
-                for thread_index in range(self._no_of_threads):
-                    scraper_instance = self._create_instance()
-                    thread_creator = Thread(target=self._handle_threads, args=(scraper_instance,), daemon=True)
-                    thread_creator.start()
-                    self._running_threads.append(thread_creator)
-
+        database_writer = Thread(target=self._database_writer, daemon=True)
+        database_writer.start()
+        try:
+            if self._use_thread:
                 def signal_handler(_, __):
+                    # Only flag the shutdown, the supervisor below winds the threads down itself
                     print("[**] Ctrl+C pressed. Closing threads...")
-                    for thread_instance in self._threads_object_instances:
-                        thread_instance.break_thread.set()
-                    sys.exit(0)
+                    self._shutdown.set()
+                    self._worker_done.set()
+                    # A second Ctrl+C raises KeyboardInterrupt instead of waiting for the workers
+                    signal.signal(signal.SIGINT, signal.default_int_handler)
 
+                # Installed before any thread starts so an early Ctrl+C still shuts down in order
                 signal.signal(signal.SIGINT, signal_handler)
+                try:
+                    # A worker failing again right after a restart is not recoverable, give up after a few
+                    worker_restarts = 0
+                    while self._git_token:
+                        self._worker_done.clear()
+                        self._rate_limited.clear()
+                        self._worker_failed.clear()
+                        self._pager_stop.clear()
+                        pager = Thread(target=self._handle_pager, args=(self._create_instance(),), daemon=True)
+                        pager.start()
+                        for thread_index in range(self._no_of_threads):
+                            scraper_instance = self._create_instance()
+                            thread_creator = Thread(target=self._handle_threads, args=(scraper_instance,), daemon=True)
+                            # Register before starting so a worker that dies immediately can still find itself
+                            with self._thread_lock:
+                                self._running_threads.add(thread_creator)
+                            thread_creator.start()
+
+                        # Block until the last worker exits instead of polling the thread list
+                        self._worker_done.wait()
+                        self._pager_stop.set()
+                        pager.join()
+                        self._reset_repo_queue()
+                        if self._shutdown.is_set():
+                            # Workers check the event between network calls, let them finish the current one
+                            with self._thread_lock:
+                                running_threads = list(self._running_threads)
+                            for running_thread in running_threads:
+                                running_thread.join()
+                            break
+
+                        if not self._rate_limited.is_set() and self._worker_failed.is_set():
+                            # Not the end of the search results, start a new batch of workers on the same token
+                            worker_restarts += 1
+                            if worker_restarts > 3:
+                                print('[**] Workers keep failing, stopping')
+                                break
+                            print('[**] Restarting the workers')
+                            self._threads_object_instances.clear()
+                            continue
+                        worker_restarts = 0
+
+                        if not self._rate_limited.is_set():
+                            # Search results ran out, another token would only walk the same results again
+                            print('[**] Search results exhausted')
+                            break
 
-                while True:
-                    time.sleep(.1)
-                    if not self._running_threads:
                         print('[**] Rate limit exceed changing token')
-                        new_file_content = TEMP_EXE.format(
-                            file_name=f"{path.basename(__file__).replace('.py', '')}",
-                            num_of_threads=self._no_of_threads,
-                            tokens_list=self._git_token[1:]
-                        )
-                        with open(file="temp.py", mode='w') as file:
-                            file.write(new_file_content)
-
-                        command = [sys.executable, path.join(path.dirname(__file__), "temp.py")]
-                        if self._git_token[1:]:
-                            subprocess.run(command)
-                            sys.exit()
-                        else:
-                            self.re_execute_main_program()
-
-                    for running_thread in self._running_threads:
-                        if not running_thread.is_alive():
-                            self._running_threads.remove(running_thread)
-
-            except Exception as e:
-                print(f"An error occurred: {str(e)}")
-
-        else:
-            try:
-                scraper_instance = self._create_instance()
-                scraper_instance.search_loop()
-            except KeyboardInterrupt:
-                print("[**] Closing Program")
+                        self._git_token.pop(0)
+                        if not self._git_token:
+                            print('[**] All tokens are exhausted')
+                            break
+
+                        # Keep the handler and its in-memory ID set, only move it to the next token
+                        self._json_handler.create_git_instance()
+                        self._threads_object_instances.clear()
+
+                except Exception as e:
+                    print(f"An error occurred: {str(e)}")
+
+            else:
+                try:
+                    scraper_instance = self._create_instance()
+                    scraper_instance.search_loop()
+                except KeyboardInterrupt:
+                    print("[**] Closing Program")
+        finally:
+            # Flush whatever the writer still holds, also when leaving early on Ctrl+C
+            self._insert_queue.put(None)
+            database_writer.join()
+            self._json_handler.close()
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown(cancel_futures=True)
+            if self._fetch_pool is not None:
+                self._fetch_pool.shutdown(cancel_futures=True)
+            self._pprints.close()
 
 
 if __name__ == "__main__":
-    obj = Scraper(number_of_threads=4, git_tokens=["token_1"])  # Provide list of github tokens or a single token
+    obj = Scraper(git_tokens=["token_1"])  # Provide list of github tokens or a single token
     obj.start_scraper()
@@ -1,80 +1,552 @@
 from sqlite3 import connect, Connection, Cursor
-from os.path import abspath, isdir
+from os.path import abspath, isdir, isfile, getsize, splitext
+from mmap import mmap, ACCESS_READ
 from traceback import format_exc
-from threading import Lock, Event
-from datetime import datetime
+from threading import Lock, Event, Timer
+from itertools import chain, groupby
 from github import Github
-from random import choice
-from os import mkdir
-import json
+from urllib3.util.retry import Retry
+from random import choices
+from os import mkdir, fsync, truncate, replace
+import atexit
+from typing import Iterator
+from array import array
+from sys import byteorder
+from bisect import bisect_left
+from time import monotonic
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    from ijson import items as json_items
+except ImportError:
+    json_items = None
+
+# Shared by every Github client: full pages cut the number of paginated requests, transient server errors and
+# dropped connections are retried with backoff on the client's keep-alive session instead of failing the worker,
+# and the connection pool is large enough for a worker and the fetch threads downloading through its client
+_GITHUB_PER_PAGE = 100
+_GITHUB_POOL_SIZE = 32
+_GITHUB_RETRY = Retry(total=5, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))
+
+
+def create_github_instance(git_token: str) -> Github:
+    """
+    Creates a Github client for a token with the settings shared by the whole scraper.
+
+    Args:
+        git_token (str): The GitHub token to authenticate with.
+    Returns:
+        Github: The GitHub client.
+    """
+
+    return Github(git_token, per_page=_GITHUB_PER_PAGE, retry=_GITHUB_RETRY, pool_size=_GITHUB_POOL_SIZE)
+
+
+# Both INSERTs are constant strings, so the write connection prepares each of them once and reuses it from its
+# statement cache for every later batch
+_INSERT_SQL = "INSERT INTO snippets (title, code, source, kind) VALUES (?, ?, ?, ?)"
+# Fold many rows into one statement while staying below SQLite's default limit of 999 bound parameters; this
+# inserts about twice as fast as a single executemany() over every row
+_ROWS_PER_STATEMENT = 900 // 4
+_MULTI_ROW_INSERT_SQL = ("INSERT INTO snippets (title, code, source, kind) VALUES " +
+                         ", ".join(["(?, ?, ?, ?)"] * _ROWS_PER_STATEMENT))
+# Rows written with a kind store their code without the "<code>\n" / "\n</code>" wrapper, the view adds it back so
+# readers get the same code column as before; rows from older versions have no kind and are already wrapped
+_WRAPPED_VIEW_SQL = '''CREATE VIEW IF NOT EXISTS snippets_wrapped AS
+                       SELECT id, title,
+                              CASE WHEN kind IS NULL THEN code
+                                   ELSE '<code>' || char(10) || code || char(10) || '</code>' END AS code,
+                              source, kind
+                       FROM snippets'''
+
+# Prompts sampled for the docstring-writing rows, built once at import and shared by every DataBaseHandler.
+# Many phrases are listed several times; dict.fromkeys() keeps the first occurrence of each so every prompt is
+# sampled with the same probability instead of the repeated ones being favoured
+_DOC_STRING_TEXTS: tuple[str, ...] = tuple(dict.fromkeys((
+    "write a docstring for this ",
+    "can you generate documentation for this code ",
+    "provide documentation for this ",
+    "please write a docstring explaining this code ",
+    "generate comments for this Python code ",
+    "create documentation for this code snippet ",
+    "add descriptive comments to this code ",
+    "explain the purpose of this code with a docstring ",
+    "generate documentation comments for this ",
+    "help me understand this code with a docstring ",
+    "write me some comments for this code ",
+    "provide details about this code with a docstring ",
+    "add explanations to this Python script ",
+    "can you describe this code with a docstring ",
+    "write a helpful docstring for this function ",
+    "generate documentation for this Python file ",
+    "add comments to clarify this code ",
+    "create a docstring for this Python function ",
+    "explain the functionality of this code with a docstring ",
+    "write me documentation for this Python class ",
+    "help me document this piece of code ",
+    "provide details about this Python module ",
+    "generate a docstring for this Python method ",
+    "add comments to make this code more understandable ",
+    "create a docstring explaining the logic of this code ",
+    "write me a description for this Python code ",
+    "generate comments to document this script ",
+    "add a docstring to explain this code ",
+    "help me with the documentation of this code ",
+    "write a docstring to describe this function ",
+    "generate documentation to explain this code ",
+    "provide insights into this Python code with a docstring ",
+    "add comments for better understanding of this code ",
+    "create a docstring for this Python class method ",
+    "write me some comments to annotate this code ",
+    "generate documentation comments for this Python file ",
+    "add descriptive comments to clarify this code ",
+    "help me understand the purpose of this code with a docstring ",
+    "write a docstring to detail the functionality of this code ",
+    "generate comments to document the logic of this code ",
+    "add explanations to this Python script with a docstring ",
+    "create documentation for this Python function ",
+    "explain the behavior of this code with a docstring ",
+    "write me documentation comments for this Python module ",
+    "provide details about this Python function with a docstring ",
+    "generate documentation for this Python class ",
+    "add comments to explain the flow of this code ",
+    "help me document this Python class ",
+    "write a docstring to describe the purpose of this code ",
+    "generate documentation to explain the functionality of this code ",
+    "add comments for better understanding of this Python script ",
+    "create a docstring for this Python module ",
+    "write me some comments to annotate this Python code ",
+    "generate documentation comments for this Python method ",
+    "add descriptive comments to clarify this Python code ",
+    "help me understand the logic of this code with a docstring ",
+    "write a docstring to detail the behavior of this Python code ",
+    "generate comments to document the purpose of this code ",
+    "add explanations to this Python function with a docstring ",
+    "create documentation for this Python class method ",
+    "explain the structure of this code with a docstring ",
+    "write me documentation comments for this Python file ",
+    "provide details about this Python script with a docstring ",
+    "generate documentation for this Python function ",
+    "add comments to explain the functionality of this code ",
+    "help me document this Python module ",
+    "write a docstring to describe the logic of this Python code ",
+    "generate documentation to explain the purpose of this code ",
+    "add comments for better understanding of this Python function ",
+    "create a docstring for this Python class ",
+    "write me some comments to annotate this Python script ",
+    "generate documentation comments for this Python class method ",
+    "add descriptive comments to clarify this Python function ",
+    "help me understand the behavior of this code with a docstring ",
+    "write a docstring to detail the structure of this Python code ",
+    "generate comments to document the behavior of this Python code ",
+    "add explanations to this Python module with a docstring ",
+    "create documentation for this Python class ",
+    "explain the functionality of this code with a docstring ",
+    "write me documentation comments for this Python function ",
+    "provide details about this Python class with a docstring ",
+    "generate documentation for this Python script ",
+    "add comments to explain the purpose of this Python code ",
+    "help me document this Python class method ",
+    "write a docstring to describe the flow of this Python code ",
+    "generate documentation to explain the logic of this Python code ",
+    "add comments for better understanding of this Python module ",
+    "create a docstring for this Python function ",
+    "write me some comments to annotate this Python class ",
+    "generate documentation comments for this Python file ",
+    "add descriptive comments to clarify this Python module ",
+    "help me understand the purpose of this Python function with a docstring ",
+    "write a docstring to detail the functionality of this Python class ",
+    "generate comments to document the structure of this Python code ",
+    "add explanations to this Python code with a docstring ",
+    "create documentation for this Python module ",
+    "explain the behavior of this Python code with a docstring ",
+    "write me documentation comments for this Python script ",
+    "provide details about this Python module with a docstring ",
+    "generate documentation for this Python class method ",
+    "add comments to explain the flow of this Python code ",
+    "help me document this Python function ",
+    "write a docstring to describe the purpose of this Python module ",
+    "generate documentation to explain the functionality of this Python class ",
+    "add comments for better understanding of this Python class method ",
+    "create a docstring for this Python script ",
+    "write me some comments to annotate this Python function ",
+    "generate documentation comments for this Python class ",
+    "add descriptive comments to clarify this Python class method ",
+    "help me understand the logic of this Python code with a docstring ",
+    "write a docstring to detail the behavior of this Python function ",
+    "generate comments to document the purpose of this Python module ",
+    "add explanations to this Python script with a docstring ",
+    "create documentation for this Python class ",
+    "explain the structure of this Python code with a docstring ",
+    "write me documentation comments for this Python function ",
+    "provide details about this Python script with a docstring ",
+    "generate documentation for this Python module ",
+    "add comments to explain the functionality of this Python class ",
+    "help me document this Python class ",
+    "write a docstring to describe the logic of this Python class method ",
+    "generate documentation to explain the purpose of this Python function ",
+    "add comments for better understanding of this Python script ",
+    "create a docstring for this Python class ",
+    "write me some comments to annotate this Python module ",
+    "generate documentation comments for this Python class method ",
+    "add descriptive comments to clarify this Python function ",
+    "help me understand the behavior of this Python code with a docstring ",
+    "write a docstring to detail the structure of this Python class ",
+    "generate comments to document the behavior of this Python class method ",
+    "add explanations to this Python module with a docstring ",
+    "create documentation for this Python class ",
+    "explain the functionality of this Python code with a docstring ",
+    "write me documentation comments for this Python function ",
+    "provide details about this Python class with a docstring ",
+    "generate documentation for this Python script ",
+    "add comments to explain the purpose of this Python code ",
+    "help me document this Python class method ",
+    "write a docstring to describe the flow of this Python class ",
+    "generate documentation to explain the logic of this Python class method ",
+    "add comments for better understanding of this Python module ",
+    "create a docstring for this Python function ",
+    "write me some comments to annotate this Python class method ",
+    "generate documentation comments for this Python file ",
+    "add descriptive comments to clarify this Python module ",
+    "help me understand the purpose of this Python function with a docstring ",
+    "write a docstring to detail the functionality of this Python class ",
+    "generate comments to document the structure of this Python code ",
+    "add explanations to this Python code with a docstring ",
+    "create documentation for this Python module ",
+    "explain the behavior of this Python code with a docstring ",
+    "write me documentation comments for this Python script ",
+    "provide details about this Python module with a docstring ",
+    "generate documentation for this Python class method ",
+    "add comments to explain the flow of this Python code ",
+    "help me document this Python function ",
+    "write a docstring to describe the purpose of this Python module ",
+    "generate documentation to explain the functionality of this Python class ",
+    "add comments for better understanding of this Python class method ",
+    "create a docstring for this Python script ",
+    "write me some comments to annotate this Python function ",
+    "generate documentation comments for this Python class ",
+    "add descriptive comments to clarify this Python class method ",
+    "help me understand the logic of this Python code with a docstring ",
+    "write a docstring to detail the behavior of this Python function ",
+    "generate comments to document the purpose of this Python module ",
+    "add explanations to this Python script with a docstring ",
+    "create documentation for this Python class ",
+    "explain the structure of this Python code with a docstring ",
+    "write me documentation comments for this Python function ",
+    "provide details about this Python script with a docstring ",
+    "generate documentation for this Python module ",
+    "add comments to explain the functionality of this Python class ",
+    "help me document this Python class ",
+    "write a docstring to describe the logic of this Python class method ",
+    "generate documentation to explain the purpose of this Python function ",
+    "add comments for better understanding of this Python script ",
+    "create a docstring for this Python class ",
+    "write me some comments to annotate this Python module ",
+    "generate documentation comments for this Python class method ",
+    "add descriptive comments to clarify this Python function ",
+    "help me understand the behavior of this Python code with a docstring ",
+    "write a docstring to detail the structure of this Python class ",
+    "generate comments to document the behavior of this Python class method ",
+    "add explanations to this Python module with a docstring ",
+    "create documentation for this Python class ",
+    "explain the functionality of this Python code with a docstring ",
+    "write me documentation comments for this Python function ",
+    "provide details about this Python class with a docstring ",
+    "generate documentation for this Python script ",
+    "add comments to explain the purpose of this Python code ",
+    "help me document this Python class method ",
+    "write a docstring to describe the flow of this Python class ",
+    "generate documentation to explain the logic of this Python class method ",
+    "add comments for better understanding of this Python module ",
+    "create a docstring for this Python function ",
+    "write me some comments to annotate this Python class method ",
+    "generate documentation comments for this Python file ",
+    "add descriptive comments to clarify this Python module ",
+    "help me understand the purpose of this Python function with a docstring ",
+    "write a docstring to detail the functionality of this Python class ",
+    "generate comments to document the structure of this Python code ",
+    "add explanations to this Python code with a docstring ",
+    "create documentation for this Python module ",
+    "explain the behavior of this Python code with a docstring ",
+    "write me documentation comments for this Python script ",
+    "provide details about this Python module with a docstring ",
+    "generate documentation for this Python class method ",
+    "add comments to explain the flow of this Python code ",
+    "help me document this Python function ",
+    "write a docstring to describe the purpose of this Python module ",
+    "generate documentation to explain the functionality of this Python class ",
+    "add comments for better understanding of this Python class method ",
+    "create a docstring for this Python script ",
+    "write me some comments to annotate this Python function ",
+    "generate documentation comments for this Python class ",
+    "add descriptive comments to clarify this Python class method ",
+    "help me understand the logic of this Python code with a docstring ",
+    "write a docstring to detail the behavior of this Python function ",
+    "generate comments to document the purpose of this Python module ",
+    "add explanations to this Python script with a docstring ",
+    "create documentation for this Python class ",
+    "explain the structure of this Python code with a docstring ",
+    "write me documentation comments for this Python function ",
+    "provide details about this Python script with a docstring ",
+    "generate documentation for this Python module ",
+    "add comments to explain the functionality of this Python class ",
+    "help me document this Python class ",
+    "write a docstring to describe the logic of this Python class method ",
+    "generate documentation to explain the purpose of this Python function ",
+    "add comments for better understanding of this Python script ",
+    "create a docstring for this Python class ",
+    "write me some comments to annotate this Python module ",
+    "generate documentation comments for this Python class method ",
+    "add descriptive comments to clarify this Python function ",
+    "help me understand the behavior of this Python code with a docstring ",
+    "write a docstring to detail the structure of this Python class ",
+    "generate comments to document the behavior of this Python class method ",
+    "add explanations to this Python module with a docstring ",
+    "create documentation for this Python class ",
+    "explain the functionality of this Python code with a docstring ",
+    "write me documentation comments for this Python function ",
+    "provide details about this Python class with a docstring ",
+    "generate documentation for this Python script ",
+    "add comments to explain the purpose of this Python code ",
+    "help me document this Python class method ",
+    "write a docstring to describe the flow of this Python class ",
+    "generate documentation to explain the logic of this Python class method ",
+    "add comments for better understanding of this Python module ",
+    "create a docstring for this Python function ",
+    "write me some comments to annotate this Python class method ",
+    "generate documentation comments for this Python file ",
+    "add descriptive comments to clarify this Python module ")))
 
 
 class JsonRecordHandler(object):
     """
     This class manages the record IDs of scraped repositories and handles JSON file operations.
 
+    The IDs are stored in a packed binary file next to the JSON file (`ids.jsonl` -> `ids.bin`), one
+    little-endian int64 per ID. It is memory-mapped on startup instead of being parsed as JSON, new IDs are
+    appended to it and it is only flushed to disk every `flush_interval` insertions. The JSON lines file is
+    kept for interoperability: it is imported when no binary file exists yet and exported on close().
+    On close() the binary file is also compacted: the appended IDs are merged into the sorted ones and duplicates
+    are dropped, so the next startup loads an already sorted file.
+
+    The IDs loaded on startup stay packed in memory as a sorted array (8 bytes per ID instead of a set entry plus
+    an int object) and are looked up by binary search, only the IDs scraped by this run are kept in a set.
+
     Args:
         - thread_lock (Lock): A thread lock for synchronization.
-        - json_file_name (str): The name of the JSON file for storing record IDs.
+        - json_file_name (str): The name of the JSON lines file for exporting record IDs.
+        - flush_interval (int): The number of new IDs after which the binary file is flushed and fsynced.
 
     Methods:
-        - dump_json(): Writes the record IDs to the JSON file.
+        - dump_json(): Flushes the appended record IDs to the binary file.
+        - export_json(): Writes all record IDs to the JSON lines file.
+        - close(): Flushes, compacts and closes the binary file and exports the JSON lines file.
+        - _compact_record_file(): Rewrites the binary file sorted and without duplicates.
         - create_git_instance(): Creates a new instance of the GitHub class with the next token.
-        - _load_json(): Loads record IDs from the JSON file.
+        - _load_json(): Loads record IDs from the binary file, or imports them from the JSON file.
         - insertion_in_record_ids(new_id): Inserts a new record ID into the set.
+        - contains(record_id): Checks whether a repository ID was already scraped.
     """
 
-    def __init__(self, total_tokens: list, thread_lock=Lock(), json_file_name: str = "ids.json") -> None:
+    def __init__(self, total_tokens: list, thread_lock=Lock(), json_file_name: str = "ids.jsonl",
+                 flush_interval: int = 1500) -> None:
         """Initialize the instance of JsonRecordHandler class"""
 
         self._thread_lock = thread_lock
         self._json_file_name: str = json_file_name
+        self._binary_file_name: str = f"{splitext(json_file_name)[0]}.bin"
+        self._flush_interval: int = flush_interval
         if not total_tokens:
             print("Github token is not provided")
             exit()
-        self._total_tokens: list = total_tokens
+        self._total_tokens: list = list(total_tokens)
         self.total_values = len(self._total_tokens)
         self.current_token: int = 1
-        self._old_time = datetime.now()
+        self._old_time: float = monotonic()
         self._wait_token_reset: float = 80.0
 
-        self.current_git_instance = Github(self._total_tokens[0])
+        self.current_git_token: str = self._total_tokens[0]
+        self.current_git_instance = create_github_instance(self.current_git_token)
         self.next_token: Event = Event()
 
+        # IDs from previous runs, sorted and packed; id_record only holds the IDs added by this run
+        self._stored_ids = array('q')
         self.id_record = set()
+        self._unsynced_ids: int = 0
         self._load_json()
+        self._record_file = open(self._binary_file_name, 'ab')
+
+    def create_git_instance(self) -> Github:
+        """
+        Creates a new instance of the GitHub class with the next token.
+
+        Returns:
+            Github: The GitHub instance for the next token.
+        """
+
+        self.current_token = self.current_token % self.total_values + 1
+        self.current_git_token = self._total_tokens[self.current_token - 1]
+        self.current_git_instance = create_github_instance(self.current_git_token)
+        return self.current_git_instance
+
+    def _sync_record_file(self) -> None:
+        """
+        Flushes the appended record IDs and fsyncs the file. The caller must hold the thread lock.
+        """
+
+        self._record_file.flush()
+        fsync(self._record_file.fileno())
+        self._unsynced_ids = 0
 
     def dump_json(self) -> None:
         """
-        Writes the record IDs to the JSON file.
+        Flushes the appended record IDs to the binary file.
+        """
+
+        with self._thread_lock:
+            self._sync_record_file()
+
+    def export_json(self) -> None:
+        """
+        Writes all record IDs to the JSON lines file, one ID per line.
         """
 
         with self._thread_lock:
             with open(self._json_file_name, 'w') as file:
-                json.dump(list(self.id_record), file)
+                # Copy the set first, workers may still add IDs without taking the lock
+                file.writelines(map("{}\n".format, chain(self._stored_ids, self.id_record.copy())))
+
+    def close(self) -> None:
+        """
+        Flushes and closes the binary file and exports the JSON lines file.
+        """
+
+        with self._thread_lock:
+            if self._record_file.closed:
+                return
+            self._sync_record_file()
+            self._record_file.close()
+            self._compact_record_file()
+        self.export_json()
+
+    def _compact_record_file(self) -> None:
+        """
+        Merges the IDs appended by this run into the sorted IDs, drops duplicates (two workers can record the same
+        repository) and atomically replaces the binary file with the result. The caller must hold the thread lock.
+        """
+
+        if not self.id_record:
+            return
+        # Both parts are already sorted runs, which timsort merges in linear time
+        merged_ids = array('q', (record_id for record_id, _ in
+                                 groupby(sorted(chain(self._stored_ids, sorted(self.id_record))))))
+        temp_file_name = f"{self._binary_file_name}.tmp"
+        with open(temp_file_name, 'wb') as file:
+            file.write(self._pack_ids(merged_ids))
+            file.flush()
+            fsync(file.fileno())
+        replace(temp_file_name, self._binary_file_name)
+        self._stored_ids = merged_ids
+        self.id_record = set()
+
+    @staticmethod
+    def _pack_ids(ids) -> bytes:
+        """
+        Packs record IDs as little-endian int64 values.
+
+        Args:
+            ids: The record IDs to pack.
+        Returns:
+            bytes: The packed IDs.
+        """
+
+        packed_ids = array('q', ids)
+        if byteorder == "big":
+            packed_ids.byteswap()
+        return packed_ids.tobytes()
 
     def _load_json(self) -> None:
         """
-        Loads record IDs from the JSON file.
+        Loads record IDs from the memory-mapped binary file. When it does not exist yet the IDs are imported
+        from the JSON file (a JSON array written by older versions, or JSON lines) and the binary file is created.
+        If the JSON lines file does not exist either, the `.json` file of the same name, the default of older
+        versions, is imported instead. JSON lines are read line by line; a JSON array is streamed with ijson when it
+        is installed.
         """
 
+        if isfile(self._binary_file_name):
+            packed_ids = array('q')
+            file_size = getsize(self._binary_file_name)
+            if file_size % packed_ids.itemsize:
+                # A crash can leave a partially written ID at the end of the file, drop it so appends stay aligned
+                file_size -= file_size % packed_ids.itemsize
+                truncate(self._binary_file_name, file_size)
+            if file_size:
+                with open(self._binary_file_name, 'rb') as file:
+                    with mmap(file.fileno(), 0, access=ACCESS_READ) as buffer:
+                        packed_ids.frombytes(buffer)
+            if byteorder == "big":
+                packed_ids.byteswap()
+            self._stored_ids = array('q', sorted(packed_ids))
+            return
+
+        json_file_name = self._json_file_name
+        if not isfile(json_file_name):
+            json_file_name = f"{splitext(json_file_name)[0]}.json"
         try:
-            with open(self._json_file_name, 'r') as file:
-                data = json.load(file)
-                self.id_record = set(data)
+            # Read as bytes, orjson parses them directly and int() accepts them as well
+            with open(json_file_name, 'rb') as file:
+                if file.read(1) == b"[":
+                    file.seek(0)
+                    if json_items is not None:
+                        # Stream the array straight into the set instead of holding the text and a full list first
+                        record_ids = set(json_items(file, "item"))
+                    else:
+                        record_ids = set(json_loads(file.read()))
+                    self._stored_ids = array('q', sorted(record_ids))
+                else:
+                    file.seek(0)
+                    self._stored_ids = array('q', sorted({int(line) for line in file if line.strip()}))
         except FileNotFoundError:
-            with self._thread_lock:
-                self.id_record = set()
+            self._stored_ids = array('q')
+
+        with open(self._binary_file_name, 'wb') as file:
+            file.write(self._pack_ids(self._stored_ids))
+
+    def contains(self, record_id: int) -> bool:
+        """
+        Checks whether a repository ID was already scraped, by this run or a previous one.
+        Args:
+            record_id (int): The repository ID to look up.
+        Returns:
+            bool: True if the ID is already recorded, False otherwise.
+        """
+
+        if record_id in self.id_record:
+            return True
+        index = bisect_left(self._stored_ids, record_id)
+        return index < len(self._stored_ids) and self._stored_ids[index] == record_id
 
     def insertion_in_record_ids(self, new_id: int) -> None:
         """
-        Inserts a new record ID into the set.
+        Inserts a new record ID into the set and appends it to the binary file.
         Args:
             new_id (int): The new record ID to be inserted.
         """
 
+        # A single set.add() is atomic (under the GIL, and behind the set's own lock on free-threaded builds),
+        # so additions and contains() need no lock; the lock only serializes the file writes
+        self.id_record.add(new_id)
+        packed_id = self._pack_ids((new_id,))
         with self._thread_lock:
-            self.id_record.add(new_id)
+            self._record_file.write(packed_id)
+            self._unsynced_ids += 1
+            if self._unsynced_ids >= self._flush_interval:
+                self._sync_record_file()
 
 
 class DataBaseHandler(object):
@@ -85,10 +557,22 @@ class DataBaseHandler(object):
         - thread_lock (Lock): A thread lock for synchronization.
         - data_base_path (str): The path where the database file will be stored.
         - data_base_file_name (str): The name of the SQLite database file.
+        - journal_mode (str): The journal mode the database file is switched to when the schema is created.
+        - synchronous (str): The PRAGMA synchronous level of every connection.
+        - cache_size (int): The PRAGMA cache_size of every connection, negative values are KiB.
+        - mmap_size (int): The number of bytes of the database file every connection may memory-map.
+        - busy_timeout (int): Milliseconds a connection retries a locked database before failing.
+        - wal_autocheckpoint (int): The number of WAL pages after which a commit checkpoints the WAL.
+        - optimize_interval (float): Seconds between two PRAGMA optimize runs on the write connection.
 
     Methods:
         - create_connection(): Creates a connection to the SQLite database and returns a connection and cursor.
+        - close(): Optimizes and closes the write connection.
+        - _optimize(): Runs PRAGMA optimize on the write connection and schedules the next run.
         - _create_database(): Initializes the database schema.
+        - build_rows(functions_data, classes_data, source, file_content): Builds the snippet rows of a single file.
+        - insert_rows(rows): Inserts a batch of snippet rows into the database inside a single transaction over the
+                             write connection.
         - insert_data(functions_data, classes_data, source): Inserts Python code snippets with docstrings into the
                                                              database.
     """
@@ -97,303 +581,134 @@ class DataBaseHandler(object):
                  thread_lock=Lock(),
                  data_base_path: str = "./database",
                  data_base_file_name: str = "python_code_snippets.db",
+                 journal_mode: str = "WAL",
+                 synchronous: str = "NORMAL",
+                 cache_size: int = -65536,
+                 mmap_size: int = 268435456,
+                 busy_timeout: int = 5000,
+                 wal_autocheckpoint: int = 10000,
+                 optimize_interval: float = 900.0,
                  ) -> None:
         """Initialize the instance of DataBaseHandler class"""
 
         self._data_base_path = abspath(data_base_path)
         self._data_file_name = data_base_file_name
         self._thread_lock = thread_lock
-        self._doc_string_texts = [
-            "write a docstring for this ",
-            "can you generate documentation for this code ",
-            "provide documentation for this ",
-            "please write a docstring explaining this code ",
-            "generate comments for this Python code ",
-            "create documentation for this code snippet ",
-            "add descriptive comments to this code ",
-            "explain the purpose of this code with a docstring ",
-            "generate documentation comments for this ",
-            "help me understand this code with a docstring ",
-            "write me some comments for this code ",
-            "provide details about this code with a docstring ",
-            "add explanations to this Python script ",
-            "can you describe this code with a docstring ",
-            "write a helpful docstring for this function ",
-            "generate documentation for this Python file ",
-            "add comments to clarify this code ",
-            "create a docstring for this Python function ",
-            "explain the functionality of this code with a docstring ",
-            "write me documentation for this Python class ",
-            "help me document this piece of code ",
-            "provide details about this Python module ",
-            "generate a docstring for this Python method ",
-            "add comments to make this code more understandable ",
-            "create a docstring explaining the logic of this code ",
-            "write me a description for this Python code ",
-            "generate comments to document this script ",
-            "add a docstring to explain this code ",
-            "help me with the documentation of this code ",
-            "write a docstring to describe this function ",
-            "generate documentation to explain this code ",
-            "provide insights into this Python code with a docstring ",
-            "add comments for better understanding of this code ",
-            "create a docstring for this Python class method ",
-            "write me some comments to annotate this code ",
-            "generate documentation comments for this Python file ",
-            "add descriptive comments to clarify this code ",
-            "help me understand the purpose of this code with a docstring ",
-            "write a docstring to detail the functionality of this code ",
-            "generate comments to document the logic of this code ",
-            "add explanations to this Python script with a docstring ",
-            "create documentation for this Python function ",
-            "explain the behavior of this code with a docstring ",
-            "write me documentation comments for this Python module ",
-            "provide details about this Python function with a docstring ",
-            "generate documentation for this Python class ",
-            "add comments to explain the flow of this code ",
-            "help me document this Python class ",
-            "write a docstring to describe the purpose of this code ",
-            "generate documentation to explain the functionality of this code ",
-            "add comments for better understanding of this Python script ",
-            "create a docstring for this Python module ",
-            "write me some comments to annotate this Python code ",
-            "generate documentation comments for this Python method ",
-            "add descriptive comments to clarify this Python code ",
-            "help me understand the logic of this code with a docstring ",
-            "write a docstring to detail the behavior of this Python code ",
-            "generate comments to document the purpose of this code ",
-            "add explanations to this Python function with a docstring ",
-            "create documentation for this Python class method ",
-            "explain the structure of this code with a docstring ",
-            "write me documentation comments for this Python file ",
-            "provide details about this Python script with a docstring ",
-            "generate documentation for this Python function ",
-            "add comments to explain the functionality of this code ",
-            "help me document this Python module ",
-            "write a docstring to describe the logic of this Python code ",
-            "generate documentation to explain the purpose of this code ",
-            "add comments for better understanding of this Python function ",
-            "create a docstring for this Python class ",
-            "write me some comments to annotate this Python script ",
-            "generate documentation comments for this Python class method ",
-            "add descriptive comments to clarify this Python function ",
-            "help me understand the behavior of this code with a docstring ",
-            "write a docstring to detail the structure of this Python code ",
-            "generate comments to document the behavior of this Python code ",
-            "add explanations to this Python module with a docstring ",
-            "create documentation for this Python class ",
-            "explain the functionality of this code with a docstring ",
-            "write me documentation comments for this Python function ",
-            "provide details about this Python class with a docstring ",
-            "generate documentation for this Python script ",
-            "add comments to explain the purpose of this Python code ",
-            "help me document this Python class method ",
-            "write a docstring to describe the flow of this Python code ",
-            "generate documentation to explain the logic of this Python code ",
-            "add comments for better understanding of this Python module ",
-            "create a docstring for this Python function ",
-            "write me some comments to annotate this Python class ",
-            "generate documentation comments for this Python file ",
-            "add descriptive comments to clarify this Python module ",
-            "help me understand the purpose of this Python function with a docstring ",
-            "write a docstring to detail the functionality of this Python class ",
-            "generate comments to document the structure of this Python code ",
-            "add explanations to this Python code with a docstring ",
-            "create documentation for this Python module ",
-            "explain the behavior of this Python code with a docstring ",
-            "write me documentation comments for this Python script ",
-            "provide details about this Python module with a docstring ",
-            "generate documentation for this Python class method ",
-            "add comments to explain the flow of this Python code ",
-            "help me document this Python function ",
-            "write a docstring to describe the purpose of this Python module ",
-            "generate documentation to explain the functionality of this Python class ",
-            "add comments for better understanding of this Python class method ",
-            "create a docstring for this Python script ",
-            "write me some comments to annotate this Python function ",
-            "generate documentation comments for this Python class ",
-            "add descriptive comments to clarify this Python class method ",
-            "help me understand the logic of this Python code with a docstring ",
-            "write a docstring to detail the behavior of this Python function ",
-            "generate comments to document the purpose of this Python module ",
-            "add explanations to this Python script with a docstring ",
-            "create documentation for this Python class ",
-            "explain the structure of this Python code with a docstring ",
-            "write me documentation comments for this Python function ",
-            "provide details about this Python script with a docstring ",
-            "generate documentation for this Python module ",
-            "add comments to explain the functionality of this Python class ",
-            "help me document this Python class ",
-            "write a docstring to describe the logic of this Python class method ",
-            "generate documentation to explain the purpose of this Python function ",
-            "add comments for better understanding of this Python script ",
-            "create a docstring for this Python class ",
-            "write me some comments to annotate this Python module ",
-            "generate documentation comments for this Python class method ",
-            "add descriptive comments to clarify this Python function ",
-            "help me understand the behavior of this Python code with a docstring ",
-            "write a docstring to detail the structure of this Python class ",
-            "generate comments to document the behavior of this Python class method ",
-            "add explanations to this Python module with a docstring ",
-            "create documentation for this Python class ",
-            "explain the functionality of this Python code with a docstring ",
-            "write me documentation comments for this Python function ",
-            "provide details about this Python class with a docstring ",
-            "generate documentation for this Python script ",
-            "add comments to explain the purpose of this Python code ",
-            "help me document this Python class method ",
-            "write a docstring to describe the flow of this Python class ",
-            "generate documentation to explain the logic of this Python class method ",
-            "add comments for better understanding of this Python module ",
-            "create a docstring for this Python function ",
-            "write me some comments to annotate this Python class method ",
-            "generate documentation comments for this Python file ",
-            "add descriptive comments to clarify this Python module ",
-            "help me understand the purpose of this Python function with a docstring ",
-            "write a docstring to detail the functionality of this Python class ",
-            "generate comments to document the structure of this Python code ",
-            "add explanations to this Python code with a docstring ",
-            "create documentation for this Python module ",
-            "explain the behavior of this Python code with a docstring ",
-            "write me documentation comments for this Python script ",
-            "provide details about this Python module with a docstring ",
-            "generate documentation for this Python class method ",
-            "add comments to explain the flow of this Python code ",
-            "help me document this Python function ",
-            "write a docstring to describe the purpose of this Python module ",
-            "generate documentation to explain the functionality of this Python class ",
-            "add comments for better understanding of this Python class method ",
-            "create a docstring for this Python script ",
-            "write me some comments to annotate this Python function ",
-            "generate documentation comments for this Python class ",
-            "add descriptive comments to clarify this Python class method ",
-            "help me understand the logic of this Python code with a docstring ",
-            "write a docstring to detail the behavior of this Python function ",
-            "generate comments to document the purpose of this Python module ",
-            "add explanations to this Python script with a docstring ",
-            "create documentation for this Python class ",
-            "explain the structure of this Python code with a docstring ",
-            "write me documentation comments for this Python function ",
-            "provide details about this Python script with a docstring ",
-            "generate documentation for this Python module ",
-            "add comments to explain the functionality of this Python class ",
-            "help me document this Python class ",
-            "write a docstring to describe the logic of this Python class method ",
-            "generate documentation to explain the purpose of this Python function ",
-            "add comments for better understanding of this Python script ",
-            "create a docstring for this Python class ",
-            "write me some comments to annotate this Python module ",
-            "generate documentation comments for this Python class method ",
-            "add descriptive comments to clarify this Python function ",
-            "help me understand the behavior of this Python code with a docstring ",
-            "write a docstring to detail the structure of this Python class ",
-            "generate comments to document the behavior of this Python class method ",
-            "add explanations to this Python module with a docstring ",
-            "create documentation for this Python class ",
-            "explain the functionality of this Python code with a docstring ",
-            "write me documentation comments for this Python function ",
-            "provide details about this Python class with a docstring ",
-            "generate documentation for this Python script ",
-            "add comments to explain the purpose of this Python code ",
-            "help me document this Python class method ",
-            "write a docstring to describe the flow of this Python class ",
-            "generate documentation to explain the logic of this Python class method ",
-            "add comments for better understanding of this Python module ",
-            "create a docstring for this Python function ",
-            "write me some comments to annotate this Python class method ",
-            "generate documentation comments for this Python file ",
-            "add descriptive comments to clarify this Python module ",
-            "help me understand the purpose of this Python function with a docstring ",
-            "write a docstring to detail the functionality of this Python class ",
-            "generate comments to document the structure of this Python code ",
-            "add explanations to this Python code with a docstring ",
-            "create documentation for this Python module ",
-            "explain the behavior of this Python code with a docstring ",
-            "write me documentation comments for this Python script ",
-            "provide details about this Python module with a docstring ",
-            "generate documentation for this Python class method ",
-            "add comments to explain the flow of this Python code ",
-            "help me document this Python function ",
-            "write a docstring to describe the purpose of this Python module ",
-            "generate documentation to explain the functionality of this Python class ",
-            "add comments for better understanding of this Python class method ",
-            "create a docstring for this Python script ",
-            "write me some comments to annotate this Python function ",
-            "generate documentation comments for this Python class ",
-            "add descriptive comments to clarify this Python class method ",
-            "help me understand the logic of this Python code with a docstring ",
-            "write a docstring to detail the behavior of this Python function ",
-            "generate comments to document the purpose of this Python module ",
-            "add explanations to this Python script with a docstring ",
-            "create documentation for this Python class ",
-            "explain the structure of this Python code with a docstring ",
-            "write me documentation comments for this Python function ",
-            "provide details about this Python script with a docstring ",
-            "generate documentation for this Python module ",
-            "add comments to explain the functionality of this Python class ",
-            "help me document this Python class ",
-            "write a docstring to describe the logic of this Python class method ",
-            "generate documentation to explain the purpose of this Python function ",
-            "add comments for better understanding of this Python script ",
-            "create a docstring for this Python class ",
-            "write me some comments to annotate this Python module ",
-            "generate documentation comments for this Python class method ",
-            "add descriptive comments to clarify this Python function ",
-            "help me understand the behavior of this Python code with a docstring ",
-            "write a docstring to detail the structure of this Python class ",
-            "generate comments to document the behavior of this Python class method ",
-            "add explanations to this Python module with a docstring ",
-            "create documentation for this Python class ",
-            "explain the functionality of this Python code with a docstring ",
-            "write me documentation comments for this Python function ",
-            "provide details about this Python class with a docstring ",
-            "generate documentation for this Python script ",
-            "add comments to explain the purpose of this Python code ",
-            "help me document this Python class method ",
-            "write a docstring to describe the flow of this Python class ",
-            "generate documentation to explain the logic of this Python class method ",
-            "add comments for better understanding of this Python module ",
-            "create a docstring for this Python function ",
-            "write me some comments to annotate this Python class method ",
-            "generate documentation comments for this Python file ",
-            "add descriptive comments to clarify this Python module "]
+        # The journal mode is stored in the database file, so it is only set once in _create_database();
+        # the other settings only last for the connection and are applied by create_connection()
+        self._journal_mode: str = journal_mode
+        self._connection_pragmas: str = (f"PRAGMA synchronous={synchronous};\n"
+                                         f"PRAGMA temp_store=MEMORY;\n"
+                                         f"PRAGMA cache_size={int(cache_size)};\n"
+                                         f"PRAGMA mmap_size={int(mmap_size)};\n"
+                                         f"PRAGMA busy_timeout={int(busy_timeout)};\n"
+                                         # Fewer, larger checkpoints suit the bursty batch commits of the writer
+                                         f"PRAGMA wal_autocheckpoint={int(wal_autocheckpoint)};\n"
+                                         # Let SQLite analyze whatever tables need it, bounded in cost
+                                         f"PRAGMA optimize=0x10002;")
+        self._optimize_interval: float = optimize_interval
+        self._optimize_timer: Timer = None
+        self._closed: bool = False
         if not isdir(self._data_base_path):
             mkdir(self._data_base_path)
 
+        # One connection for every insert, used from whichever thread writes, always under the thread lock. Its cursor
+        # is kept as well: Connection.execute() and executemany() would allocate a new cursor on every call
+        self._write_connection, self._write_cursor = self.create_connection(check_same_thread=False)
         self._create_database()
+        self._schedule_optimize()
+        atexit.register(self.close)
 
-    def create_connection(self) -> tuple[Connection, Cursor]:
+    def create_connection(self, check_same_thread: bool = True) -> tuple[Connection, Cursor]:
         """
-        Creates a connection to the SQLite database and returns a connection and cursor.
+        Creates a connection to the SQLite database, applies the write-performance PRAGMAs and returns a
+        connection and cursor. The connection is in autocommit mode, transactions are opened explicitly.
 
+        Args:
+            check_same_thread (bool, optional): Whether only the creating thread may use the connection.
+                                                Defaults to True.
         Returns:
             tuple[Connection, Cursor]: A tuple containing the database connection and cursor.
         """
 
         with self._thread_lock:
-            database_connection = connect(f"{self._data_base_path}/{self._data_file_name}")
+            database_connection = connect(f"{self._data_base_path}/{self._data_file_name}", isolation_level=None,
+                                          check_same_thread=check_same_thread)
             cursor = database_connection.cursor()
+            # WAL with synchronous=NORMAL only fsyncs on checkpoints instead of on every commit
+            cursor.executescript(self._connection_pragmas)
             return database_connection, cursor
 
+    def _schedule_optimize(self) -> None:
+        """
+        Starts a daemon timer running _optimize() after `optimize_interval` seconds.
+        """
+
+        self._optimize_timer = Timer(self._optimize_interval, self._optimize)
+        self._optimize_timer.daemon = True
+        self._optimize_timer.start()
+
+    def _optimize(self) -> None:
+        """
+        Runs PRAGMA optimize on the write connection so the statistics keep up with a long scrape, then schedules
+        the next run.
+        """
+
+        with self._thread_lock:
+            if self._closed:
+                return
+            try:
+                self._write_cursor.execute("PRAGMA optimize")
+            except Exception as e:
+                print(f"[**] PRAGMA optimize failed: {e}")
+            self._schedule_optimize()
+
+    def close(self) -> None:
+        """
+        Stops the optimize timer, optimizes and closes the write connection. Called on interpreter exit as well,
+        closing twice is harmless.
+        """
+
+        with self._thread_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._optimize_timer.cancel()
+            self._write_cursor.execute("PRAGMA optimize")
+            self._write_connection.close()
+
     def _create_database(self) -> None:
         """
-        Initializes the database schema.
+        Initializes the database schema on the write connection.
+
+        `id` is a plain INTEGER PRIMARY KEY (an alias of the rowid), which still numbers the rows in insertion order
+        without the `sqlite_sequence` update AUTOINCREMENT costs on every insert. Databases created by older versions
+        keep their AUTOINCREMENT table and work unchanged.
+
+        `kind` tells what the code column holds ('bare': code without its docstring, 'with_doc': code with its
+        docstring, 'file': the whole file); it is added to tables created by older versions. The
+        `snippets_wrapped` view returns the code wrapped in `<code>` tags like it used to be stored.
         """
 
-        database_connection, cursor = self.create_connection()
+        cursor = self._write_cursor
+        cursor.execute(f"PRAGMA journal_mode={self._journal_mode}")
         cursor.execute('''CREATE TABLE IF NOT EXISTS snippets (
-                           id INTEGER PRIMARY KEY AUTOINCREMENT,
+                           id INTEGER PRIMARY KEY,
                            title TEXT,
                            code TEXT,
-                           source TEXT
+                           source TEXT,
+                           kind TEXT
                            )
                    ''')
-        database_connection.commit()
-        database_connection.close()
+        if "kind" not in {column[1] for column in cursor.execute("PRAGMA table_info(snippets)")}:
+            cursor.execute("ALTER TABLE snippets ADD COLUMN kind TEXT")
+        cursor.execute(_WRAPPED_VIEW_SQL)
 
-    def insert_data(self, functions_data: list, classes_data: list, source: str, file_content: str) -> bool:
+    def build_rows(self, functions_data: list, classes_data: list, source: str,
+                   file_content: str) -> Iterator[tuple]:
         """
-        Inserts Python code snippets with docstrings into the database.
+        Builds the snippet rows for the Python code snippets with docstrings of a single file. The rows are
+        yielded one by one so callers extend their pending batch without a list per file.
 
         Args:
             functions_data (list): List of tuples containing docstrings, function definitions, and function
@@ -402,56 +717,86 @@ class DataBaseHandler(object):
             source (str): The source of the code snippets.
             file_content (str): The content of the entire file.
         Returns:
-            bool: True if the insertion is successful, False otherwise.
+            Iterator[tuple]: The (title, code, source, kind) rows ready to be inserted, the code is not wrapped in
+                             `<code>` tags.
         """
-        database_connection, cursor = self.create_connection()
-        try:
-            for doc_func in functions_data:
-                docstring = doc_func[0].strip()  # doc string
+
+        # Values stay str: sqlite3 binds them from the string's own UTF-8 buffer, pre-encoding to bytes measured slower
+        # and would store BLOBs instead of TEXT
+        # One prompt per snippet, drawn in a single call; an entry skipped for an empty docstring just leaves one
+        # unused
+        prompts = iter(choices(_DOC_STRING_TEXTS, k=len(functions_data) + len(classes_data)))
+        classes_docs_parts: list[str] = []
+        for snippets, is_class in ((functions_data, False), (classes_data, True)):
+            for snippet in snippets:
+                docstring = snippet[0].strip()  # doc string
                 if not docstring:
                     continue
-                function_content = f"<code>\n{doc_func[1].strip()}\n</code>"  # with doc string
-                function_content_without_doc_sting = doc_func[2].strip()  # without doc string
+                if is_class:
+                    classes_docs_parts.append(docstring)
+                with_doc = snippet[1].strip()  # with doc string
+                no_doc = snippet[2].strip()  # without doc string
                 # For title code generation system
-                with self._thread_lock:
-                    cursor.execute("INSERT INTO snippets (title, code, source) VALUES (?, ?, ?)",
-                                   (docstring, f"<code>\n{function_content_without_doc_sting}\n</code>", source))
-
-                    # For writing doc strings
-                    cursor.execute("INSERT INTO snippets (title, code, source) VALUES (?, ?, ?)",
-                                   (f"{choice(self._doc_string_texts)}\n{function_content_without_doc_sting}",
-                                    function_content, source))
-
-            classes_docs: str = ""
-            for doc_func in classes_data:
-                docstring = doc_func[0].strip()  # doc string
-                if not docstring:
-                    continue
-                classes_docs += f"{docstring}\n"
-                function_content = f"<code>\n{doc_func[1].strip()}\n</code>"  # with doc string
-                function_content_without_doc_sting = doc_func[2].strip()  # without doc string
-                # For title code generation system of class-based code
-                with self._thread_lock:
-                    cursor.execute("INSERT INTO snippets (title, code, source) VALUES (?, ?, ?)",
-                                   (docstring,  f"<code>\n{function_content_without_doc_sting}\n</code>", source))
-
-                    # For writing doc strings
-                    cursor.execute("INSERT INTO snippets (title, code, source) VALUES (?, ?, ?)",
-                                   (f"{choice(self._doc_string_texts)}\n{function_content_without_doc_sting}",
-                                    function_content, source))
-
-            classes_docs = classes_docs.strip()
-            if classes_docs:
-                # For complete file name with classes docs as a title
-                with self._thread_lock:
-                    cursor.execute("INSERT INTO snippets (title, code, source) VALUES (?, ?, ?)",
-                                   (classes_docs, f"<code>\n{file_content}\n</code>", source))
-
-        except Exception as e:
-            traceback_str = format_exc()
-            print(traceback_str + "\n" + str(e))
-            return False
+                yield docstring, no_doc, source, "bare"
+                # For writing doc strings
+                yield f"{next(prompts)}\n{no_doc}", with_doc, source, "with_doc"
+
+        classes_docs = "\n".join(classes_docs_parts).strip()
+        if classes_docs:
+            # For complete file name with classes docs as a title
+            yield classes_docs, file_content, source, "file"
+
+    def insert_rows(self, rows: list) -> bool:
+        """
+        Inserts a batch of snippet rows into the database inside a single transaction on the write connection.
+        Full chunks of `_ROWS_PER_STATEMENT` rows go through one multi-row INSERT, the remainder through
+        executemany.
+
+        Args:
+            rows (list): List of (title, code, source, kind) tuples as yielded by build_rows().
+        Returns:
+            bool: True if the insertion is successful, False otherwise.
+        """
+
+        if not rows:
+            return True
+        # Everything that does not touch the connection is prepared before taking the lock
+        full_chunks_end = len(rows) - len(rows) % _ROWS_PER_STATEMENT
+        chunk_parameters = [list(chain.from_iterable(rows[chunk_start:chunk_start + _ROWS_PER_STATEMENT]))
+                            for chunk_start in range(0, full_chunks_end, _ROWS_PER_STATEMENT)]
+        remaining_rows = rows[full_chunks_end:]
+        cursor = self._write_cursor
+        traceback_str = None
         with self._thread_lock:
-            database_connection.commit()
-            database_connection.close()
+            try:
+                # Take the write lock up front instead of upgrading a read lock halfway through the batch
+                cursor.execute("BEGIN IMMEDIATE")
+                for parameters in chunk_parameters:
+                    cursor.execute(_MULTI_ROW_INSERT_SQL, parameters)
+                cursor.executemany(_INSERT_SQL, remaining_rows)
+                cursor.execute("COMMIT")
+            except Exception:
+                traceback_str = format_exc()
+                if self._write_connection.in_transaction:
+                    cursor.execute("ROLLBACK")
+        if traceback_str is not None:
+            print(traceback_str)
+            return False
         return True
+
+    def insert_data(self, functions_data: list, classes_data: list, source: str, file_content: str) -> bool:
+        """
+        Inserts Python code snippets with docstrings into the database.
+
+        Args:
+            functions_data (list): List of tuples containing docstrings, function definitions, and function
+                                   without docstring.
+            classes_data (list): List of tuples containing docstrings, class definitions, and class without docstring.
+            source (str): The source of the code snippets.
+            file_content (str): The content of the entire file.
+        Returns:
+            bool: True if the insertion is successful, False otherwise.
+        """
+
+        return self.insert_rows(list(self.build_rows(functions_data=functions_data, classes_data=classes_data,
+                                                     source=source, file_content=file_content)))
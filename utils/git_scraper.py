@@ -1,28 +1,363 @@
 from github.Repository import Repository
 
-from utils.database_handler import DataBaseHandler, JsonRecordHandler
+from utils.database_handler import DataBaseHandler, JsonRecordHandler, create_github_instance, _GITHUB_RETRY
 from github.GithubException import RateLimitExceededException
-from github import PaginatedList
-from requests.exceptions import Timeout
+from github import PaginatedList, Github
+from requests.exceptions import Timeout, RequestException
+from requests.adapters import HTTPAdapter
+from requests import Session
 from traceback import format_exc
 from pprint import pprint
 from threading import Lock, Event
+from queue import Queue, Full, Empty
 from utils.pprints import PPrints
-from textwrap import fill
+from textwrap import TextWrapper
+from hashlib import blake2b
+from base64 import b64decode
+from functools import lru_cache, partial, wraps
+from concurrent.futures import Executor, BrokenExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Iterator
+from bisect import bisect_left
+from collections import deque
 import time
-import sys
 import ast
 import re
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    # Optional C parser; without it the files are parsed with the ast module
+    from tree_sitter import Language, Parser
+    import tree_sitter_python
+    _TS_PARSER = Parser(Language(tree_sitter_python.language()))
+except (ImportError, TypeError, ValueError):
+    # Missing, or older than the tree_sitter 0.22 API, or a tree_sitter_python built for another version
+    _TS_PARSER = None
+
+_DEFINITION_NODES = (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+# Definitions only appear in statement lists, so the walks never descend into expressions
+_STATEMENT_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+_TS_DEFINITION_TYPES = ("function_definition", "class_definition")
+_TS_STATEMENT_CONTAINERS = frozenset((
+    "module", "block", "decorated_definition", "function_definition", "class_definition", "if_statement",
+    "elif_clause", "else_clause", "for_statement", "while_statement", "try_statement", "except_clause",
+    "except_group_clause", "finally_clause", "with_statement", "match_statement", "case_clause"))
+# tree-sitter-python also accepts these Python 2 statements, files using them are skipped like ast skips them
+_TS_PYTHON2_TYPES = ("print_statement", "exec_statement")
+# Larger files are almost always generated or vendored bundles, slow to parse and of little value for the dataset
+_MAX_FILE_SIZE = 1024 * 1024
+# The docstring is reflowed by the wrapper anyway, so its indentation and line breaks collapse to single spaces
+_WS_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=None)
+def _create_text_wrapper(width: int) -> TextWrapper:
+    """
+    Creates the docstring wrapper for a width, once per process and width.
+
+    Args:
+        width (int): The width used for wrapping docstrings.
+    Returns:
+        TextWrapper: The shared wrapper.
+    """
+
+    # Not splitting words or hyphens keeps identifiers and URLs intact and lets textwrap use its simpler
+    # word-splitting regex
+    return TextWrapper(width=width, subsequent_indent=' ' * 8, break_long_words=False, break_on_hyphens=False)
+
+
+def _strip_docstring_spans(source: bytes, start: int, end: int, doc_spans: list) -> bytes:
+    """
+    Slices a definition out of the file with the given docstring statements removed. A docstring on lines of its
+    own is dropped with its lines; one that is the only statement of its body or shares a line with other code is
+    replaced by `pass` so the code stays valid.
+
+    Args:
+        source (bytes): The UTF-8 encoded file.
+        start (int): The byte offset the definition starts at.
+        end (int): The byte offset the definition ends at.
+        doc_spans (list): Sorted (start, end, sole statement) byte spans of the docstrings within the definition.
+    Returns:
+        bytes: The definition without the docstrings.
+    """
+
+    pieces = []
+    position = start
+    for doc_start, doc_end, sole in doc_spans:
+        line_start = source.rfind(b"\n", 0, doc_start) + 1
+        line_end = source.find(b"\n", doc_end)
+        line_end = end if line_end == -1 else min(line_end + 1, end)
+        if sole or source[line_start:doc_start].strip() or source[doc_end:line_end].strip():
+            pieces += (source[position:doc_start], b"pass")
+        else:
+            pieces.append(source[position:line_start])
+            doc_end = line_end
+        position = doc_end
+    pieces.append(source[position:end])
+    return b"".join(pieces)
+
+
+def _dedent_definition(source: bytes, start: int, code: bytes) -> str:
+    """
+    Removes the indentation a nested definition has in its file from every line of its code. Lines indented
+    less, which can only be continuation lines of strings, are kept as they are.
+
+    Args:
+        source (bytes): The UTF-8 encoded file.
+        start (int): The byte offset the definition starts at.
+        code (bytes): The code sliced from the file starting at start.
+    Returns:
+        str: The dedented code.
+    """
+
+    indent = source[source.rfind(b"\n", 0, start) + 1:start]
+    if not indent or indent.strip():
+        # A top level definition, or one that does not start its line, e.g. after a semicolon
+        return code.decode()
+    return code.replace(b"\n" + indent, b"\n").decode()
+
+
+def _parse_definitions(tree: ast.Module, source: bytes, text_wrapper: TextWrapper,
+                       node_types: tuple = _DEFINITION_NODES) -> tuple[list, list]:
+    """
+    Extracts the documented functions and classes from a parsed file in a single walk over its statements. The
+    code is sliced from the file by the offsets of the nodes instead of being unparsed.
+
+    Args:
+        tree (ast.Module): The parsed file.
+        source (bytes): The UTF-8 encoded file the tree was parsed from.
+        text_wrapper (TextWrapper): The wrapper formatting the docstrings.
+        node_types (tuple, optional): The ast node classes to extract. Defaults to functions and classes.
+    Returns:
+        tuple[list, list]: The functions and the classes, each a list of tuples containing the formatted
+                           docstring, the definition and the definition without docstrings.
+    """
+
+    # ast columns are UTF-8 byte offsets, so the file is sliced as bytes
+    line_offsets = [0]
+    for line in source.splitlines(keepends=True):
+        line_offsets.append(line_offsets[-1] + len(line))
+
+    definitions, doc_spans = [], []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        for field in _STATEMENT_FIELDS:
+            statements = getattr(node, field, None)
+            if statements:
+                stack.extend(reversed(statements))
+        if not isinstance(node, _DEFINITION_NODES):
+            continue
+        docstring = ast.get_docstring(node, clean=False)
+        if docstring is None:
+            continue
+        # Nested docstrings are cut from the code even when only the other kind of definition is extracted
+        statement = node.body[0]
+        doc_spans.append((line_offsets[statement.lineno - 1] + statement.col_offset,
+                          line_offsets[statement.end_lineno - 1] + statement.end_col_offset, len(node.body) == 1))
+        if isinstance(node, node_types):
+            definitions.append((node, docstring))
+
+    doc_spans.sort()
+    doc_starts = [span[0] for span in doc_spans]
+    functions, classes = [], []
+    for node, docstring in definitions:
+        if node.decorator_list:
+            # Decorators belong to the definition, the node only starts at its def/class keyword
+            decorator = node.decorator_list[0]
+            start = source.rfind(b"@", 0, line_offsets[decorator.lineno - 1] + decorator.col_offset)
+        else:
+            start = line_offsets[node.lineno - 1] + node.col_offset
+        end = line_offsets[node.end_lineno - 1] + node.end_col_offset
+        spans = doc_spans[bisect_left(doc_starts, start):bisect_left(doc_starts, end)]
+        formatted_doc_string = text_wrapper.fill(_WS_RE.sub(" ", docstring).strip())
+        (classes if isinstance(node, ast.ClassDef) else functions).append(
+            (formatted_doc_string, _dedent_definition(source, start, source[start:end]),
+             _dedent_definition(source, start, _strip_docstring_spans(source, start, end, spans))))
+    return functions, classes
+
+
+def _ts_docstring(definition) -> tuple:
+    """
+    Finds the docstring of a tree-sitter function or class definition, i.e. a string literal as the first
+    statement of its body.
+
+    Args:
+        definition: The tree-sitter definition node.
+    Returns:
+        tuple: The docstring, its statement node and whether it is the only statement of the body; None if the
+               definition has no docstring.
+    """
+
+    body = definition.child_by_field_name("body")
+    if body is None:
+        return None
+    statements = [child for child in body.named_children if child.type != "comment"]
+    if not statements or statements[0].type != "expression_statement" or statements[0].named_child_count != 1:
+        return None
+    expression = statements[0].named_children[0]
+    if expression.type not in ("string", "concatenated_string"):
+        return None
+    try:
+        docstring = ast.literal_eval(expression.text.decode())
+    except (ValueError, SyntaxError):
+        # f-strings are no docstrings
+        return None
+    if not isinstance(docstring, str):
+        return None
+    return docstring, statements[0], len(statements) == 1
+
+
+def _ts_end_byte(node) -> int:
+    """
+    Finds where the code of a tree-sitter node ends. Comments after the last statement of a block belong to the
+    block in tree-sitter, while the ast module ends a definition at its last statement; they are left out.
+
+    Args:
+        node: The tree-sitter node.
+    Returns:
+        int: The offset right after the last token of the node that is not a comment.
+    """
+
+    while node.child_count:
+        last = node.children[-1]
+        if last.type == "comment":
+            code = [child for child in node.children if child.type != "comment"]
+            if not code:
+                break
+            node = code[-1]
+        elif last.end_byte == node.end_byte:
+            node = last
+        else:
+            break
+    return node.end_byte
+
+
+def _parse_definitions_tree_sitter(source: bytes, text_wrapper: TextWrapper) -> tuple[list, list]:
+    """
+    Extracts the documented functions and classes of a file with tree-sitter, slicing the code from the file
+    like _parse_definitions() does.
+
+    Args:
+        source (bytes): The UTF-8 encoded file.
+        text_wrapper (TextWrapper): The wrapper formatting the docstrings.
+    Returns:
+        tuple[list, list]: The functions and the classes, each a list of tuples containing the formatted
+                           docstring, the definition and the definition without docstrings.
+    """
+
+    root = _TS_PARSER.parse(source).root_node
+    if root.has_error:
+        return [], []
+    definitions, doc_spans = [], []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.type in _TS_PYTHON2_TYPES:
+            return [], []
+        if node.type in _TS_DEFINITION_TYPES:
+            found = _ts_docstring(node)
+            if found is not None:
+                docstring, statement, sole = found
+                definitions.append((node, docstring))
+                doc_spans.append((statement.start_byte, statement.end_byte, sole))
+        if node.type in _TS_STATEMENT_CONTAINERS:
+            stack.extend(reversed(node.named_children))
+
+    doc_spans.sort()
+    doc_starts = [span[0] for span in doc_spans]
+    functions, classes = [], []
+    for node, docstring in definitions:
+        # Decorators belong to the definition
+        outer = node.parent if node.parent.type == "decorated_definition" else node
+        start, end = outer.start_byte, _ts_end_byte(outer)
+        spans = doc_spans[bisect_left(doc_starts, start):bisect_left(doc_starts, end)]
+        formatted_doc_string = text_wrapper.fill(_WS_RE.sub(" ", docstring).strip())
+        (classes if node.type == "class_definition" else functions).append(
+            (formatted_doc_string, _dedent_definition(source, start, source[start:end]),
+             _dedent_definition(source, start, _strip_docstring_spans(source, start, end, spans))))
+    return functions, classes
+
+
+def _may_have_docstrings(file_content: str) -> bool:
+    """
+    Cheaply tells whether a file can hold a docstring worth parsing it for.
+
+    Args:
+        file_content (str): The content of the Python file.
+    Returns:
+        bool: False when the file has no triple-quoted string or is too large to be worth parsing.
+    """
+
+    return len(file_content) <= _MAX_FILE_SIZE and ('"""' in file_content or "'''" in file_content)
+
+
+def parse_python_file(file_content: str, wrap_width: int) -> tuple[list, list]:
+    """
+    Parses a Python file once and extracts both its documented functions and classes in one walk over the
+    tree, with tree-sitter when it is installed and the ast module otherwise. Defined at module level so a
+    process pool can run it.
+
+    Args:
+        file_content (str): The content of the Python file.
+        wrap_width (int): The width used for wrapping docstrings.
+    Returns:
+        tuple[list, list]: The parsed functions and the parsed classes.
+    """
+
+    if not _may_have_docstrings(file_content):
+        return [], []
+    if _TS_PARSER is not None:
+        return _parse_definitions_tree_sitter(file_content.encode(), _create_text_wrapper(wrap_width))
+    try:
+        tree = ast.parse(file_content)
+    except (SyntaxError, ValueError):
+        # Raise due to python-2 version code or null bytes in the file
+        return [], []
+    return _parse_definitions(tree, file_content.encode(), _create_text_wrapper(wrap_width))
+
+
+def _net_guard(method: Callable) -> Callable:
+    """
+    Decorates a GitScraper request method: an exceeded rate limit switches to another token, or waits for the
+    reset, and retries the request; a timeout or any other failed request, or a rate limit that cannot be
+    recovered from, stops the instance through its break_thread event and the method returns None instead of
+    raising.
+
+    Args:
+        method (Callable): The request method to guard.
+    Returns:
+        Callable: The guarded method.
+    """
+
+    @wraps(method)
+    def guarded(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        except Timeout:
+            self._stop_thread(status="Look Like no internet connection Error:", info_type=3, with_traceback=True)
+        except RequestException:
+            # Connection errors and server errors that are still failing after the retries of the session
+            self._stop_thread(status="Request failed Error:", info_type=3, with_traceback=True)
+        except RateLimitExceededException as error:
+            if self._recover_rate_limit(error.headers):
+                return guarded(self, *args, **kwargs)
+            self._stop_thread(status=f"Rate limit exceeded for token {self._git_token}")
+        return None
+
+    return guarded
+
 
 class GitScraper(object):
     """
     This class is responsible for scraping Python code snippets with docstrings from GitHub repositories.
 
     Args:
-        - git_instance (Github): A GitHub instance for authentication.
         - json_handler (JsonRecordHandler): An instance of JsonRecordHandler for managing record IDs.
-        - thread_lock (Lock): A thread lock to handle synchronization between threads.
+        - thread_lock (Lock): A thread lock guarding database access between threads.
         - search_query (str): The GitHub search query used to filter repositories.
         - id_record_file (str): The file name for storing scraped repository IDs.
         - db_commit_index (int): The number of records after which the database is committed.
@@ -31,61 +366,119 @@ class GitScraper(object):
         - verbose (bool): Whether to print verbose status messages.
         - data_base_path (str): The path where the SQLite database will be stored.
         - data_base_file_name (str): The name of the SQLite database file.
+        - git_token (str): The GitHub token dedicated to this instance.
+        - token_provider (Callable): Callback returning the token to switch to once the current one is exhausted.
+        - rate_limit_threshold (int): Remaining core requests at or below which the token is considered exhausted.
+        - insert_queue (Queue): Queue consumed by a single database writer; when None the instance writes itself.
+        - shutdown_event (Event): An event shared by all workers that signals them to stop.
+        - seen_file_hashes (set): Digests of the file contents already processed, shared by all workers.
+        - queued_ids (set): IDs of the repositories queued or being scraped in this run, shared by all instances.
+        - parse_pool (Executor): A process pool the files are parsed in; when None they are parsed in this thread.
+        - fetch_pool (Executor): A thread pool downloading the files of a repository concurrently; when None they
+                                 are downloaded one after another.
+        - fetch_window (int): The most downloads this instance keeps in flight on the fetch_pool at once.
 
     Attributes:
-        - break_thread (Event): An event to signal thread termination.
+        - break_thread (Event): Set when a request timed out or hit the rate limit; the instance stops working.
 
     Methods:
         - py_class_parser(file_content): Parses Python class definitions and their docstrings.
         - py_function_parser(file_content): Parses Python function definitions and their docstrings.
-        - get_repos(): Retrieves a list of repositories based on the search query.
+        - parse_file(file_content): Parses a file once and extracts both its functions and classes, in the parse
+                                    pool when one is set.
+        - get_repos(): Retrieves the not yet scraped repositories matching the search query.
         - get_single_repo(repo_name): Retrieves a single repository by name or ID.
-        - get_sub_dirs(raw_contents, repo, branch): Retrieves subdirectories within a repository.
-        - get_python_content_files(raw_contents, repo, branch, sub_dirs): Retrieves Python content files within a repository.
-        - get_file_content(file): Retrieves the content of a file.
+        - get_python_content_files(repo, branch): Retrieves Python content files within a repository.
+        - get_file_content(repo, file): Retrieves the content of a file.
+        - _get_search_page(page): Requests a page of the repository search.
+        - _recover_rate_limit(headers): Switches token or waits for the reset after a request hit the rate limit.
+        - _wait_for_rate_limit(): Switches token or sleeps when the current token is nearly exhausted.
+        - _store_file_data(doc_functions, doc_classes, source, file_content): Hands parsed file data to the database.
+        - _flush_pending_rows(): Inserts the rows buffered by _store_file_data() in one transaction.
+        - _bind_repo(repo): Builds a repository on this instance's client.
+        - _fetch_file_contents(repo, contents_files, futures): Downloads files on the fetch_pool in a sliding window.
+        - process_repo(repo): Scrapes a single repository and hands the parsed files to the database.
+        - _scrape_repo(repo): Runs process_repo(), logging the errors of a repository instead of raising them.
+        - produce_repos(repo_queue, consumers, stop_event): Pages through the search results into a queue.
+        - consume_repos(repo_queue): Scrapes the repositories taken from a queue.
         - search_loop(): Initiates the repository scraping process in a loop.
         - single_loop(): Initiates the scraping process for a single repository.
         - _pprint_override(status, info_type, logs): Prints formatted status messages.
     """
 
-    _SUB_DOC_PATTERN = r'\"\"\"[\s\S]*?\"\"\"'
-    _info_types: dict = {
-        1: "INFO",
-        2: "WARNING",
-        3: "ERROR"
-    }
+    _SEARCH_URL = "https://api.github.com/search/repositories"
+    _SEARCH_PAGE_SIZE = 100
+    _REQUEST_TIMEOUT = 15
+    # Seconds a worker waits for the parse pool before parsing the file itself
+    _PARSE_TIMEOUT = 120
+    # Indexed by info_type - 1
+    _info_types: tuple = ("INFO", "WARNING", "ERROR")
 
     def __init__(self,
                  json_handler: JsonRecordHandler,
                  thread_lock: Lock = Lock(),
                  search_query: str = "language:python",
-                 id_record_file: str = "ids.json",
+                 id_record_file: str = "ids.jsonl",
                  db_commit_index: int = 1500,
                  width_for_wrap: int = 70,
-                 pprints: PPrints = PPrints(),
+                 pprints: PPrints = None,
                  verbose: bool = True,
                  data_base_path: str = "./database",
                  data_base_file_name: str = "python_code_snippets.db",
+                 git_token: str = None,
+                 token_provider: Callable[[str, int, float], str] = None,
+                 rate_limit_threshold: int = 10,
+                 insert_queue: Queue = None,
+                 shutdown_event: Event = None,
+                 seen_file_hashes: set = None,
+                 queued_ids: set = None,
+                 parse_pool: Executor = None,
+                 fetch_pool: Executor = None,
+                 fetch_window: int = 16,
                  ) -> None:
         """
         Initializes a new instance of the GitScraper class.
 
         Args:
             json_handler (JsonRecordHandler): An instance of JsonRecordHandler for managing record IDs.
-            thread_lock (Lock, optional): A thread lock to handle synchronization between threads. Defaults to Lock().
+            thread_lock (Lock, optional): A thread lock guarding database access between threads. Defaults to Lock().
             search_query (str, optional): The GitHub search query used to filter repositories.
                                           Defaults to "language:python".
-            id_record_file (str, optional): The file name for storing scraped repository IDs. Defaults to "ids.json".
+            id_record_file (str, optional): The file name for storing scraped repository IDs. Defaults to "ids.jsonl".
             db_commit_index (int, optional): The number of records after which the database is committed.
                                              Defaults to 1500.
             width_for_wrap (int, optional): The width used for wrapping docstrings. Defaults to 70.
             pprints (PPrints, optional): An instance of PPrints for pretty-printing status messages.
-                                         Defaults to PPrints().
+                                         Defaults to a new PPrints instance.
             verbose (bool, optional): Whether to print verbose status messages. Defaults to True.
             data_base_path (str, optional): The path where the SQLite database will be stored.
                                             Defaults to "./database".
             data_base_file_name (str, optional): The name of the SQLite database file.
                                                  Defaults to "python_code_snippets.db".
+            git_token (str, optional): The GitHub token dedicated to this instance. Defaults to the current
+                                       token of the json_handler.
+            token_provider (Callable, optional): Called with (token, remaining, reset_time) when the token is
+                                                 nearly exhausted and returns the token to use next.
+                                                 Defaults to None (sleep until the reset time).
+            rate_limit_threshold (int, optional): Remaining core requests at or below which the token is
+                                                  considered exhausted. Defaults to 10.
+            insert_queue (Queue, optional): Queue consumed by a single database writer. Defaults to None, in which
+                                            case the instance opens its own DataBaseHandler and writes directly.
+            shutdown_event (Event, optional): An event shared by all workers that signals them to stop.
+                                              Defaults to a new Event owned by this instance.
+            seen_file_hashes (set, optional): Digests of the file contents already processed, shared by all
+                                              workers. Defaults to a new set owned by this instance.
+            queued_ids (set, optional): IDs of the repositories queued or being scraped in this run, so the
+                                        pagers do not queue them twice. Defaults to a new set owned by this
+                                        instance.
+            parse_pool (Executor, optional): A process pool shared by all workers that parses the files so the
+                                             parsing runs outside the GIL of the scraper. Defaults to None (parse
+                                             in the calling thread).
+            fetch_pool (Executor, optional): A thread pool shared by all workers that downloads the files of a
+                                             repository concurrently. Defaults to None (download one by one).
+            fetch_window (int, optional): The most downloads this instance keeps in flight on the fetch_pool, so
+                                          a large repository does not queue all of its files ahead of the other
+                                          workers. Defaults to 16.
         """
 
         # Customizable variables
@@ -95,15 +488,38 @@ class GitScraper(object):
         self._db_commit_index: int = db_commit_index
         self._json_handler: JsonRecordHandler = json_handler
         self._wrap_width: int = width_for_wrap
-        self._pprints = pprints
+        self._text_wrapper: TextWrapper = _create_text_wrapper(self._wrap_width)
+        self._pprints = pprints if pprints is not None else PPrints()
         self._verbose = verbose
+        self._token_provider = token_provider
+        self._rate_limit_threshold: int = rate_limit_threshold
+        self._shutdown: Event = shutdown_event if shutdown_event is not None else Event()
+        self._seen_file_hashes: set = seen_file_hashes if seen_file_hashes is not None else set()
+        self._queued_ids: set = queued_ids if queued_ids is not None else set()
+        self._parse_pool: Executor = parse_pool
+        self._fetch_pool: Executor = fetch_pool
+        self._fetch_window: int = max(1, fetch_window)
+        # Set once a request of this instance timed out or hit the rate limit, the instance then stops working
         self.break_thread = Event()
+        # Search results are paged with a plain keep-alive session instead of PyGithub's model objects
+        self._session = Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=_GITHUB_RETRY))
+        self._session.headers["Accept"] = "application/vnd.github+json"
+        if git_token is None:
+            self._set_token(self._json_handler.current_git_token, self._json_handler.current_git_instance)
+        else:
+            self._set_token(git_token)
 
         # Script Customizable variables
         self._current_repo = "Calculating ....."
         self._current_repo_id = "Calculating ....."
-        self._database_handler = DataBaseHandler(thread_lock=self._thread_lock, data_base_path=data_base_path,
-                                                 data_base_file_name=data_base_file_name)
+        self._insert_queue: Queue = insert_queue
+        self._database_handler = None
+        # Rows waiting for the next batched insert when this instance writes to the database itself
+        self._pending_rows: list = []
+        if self._insert_queue is None:
+            self._database_handler = DataBaseHandler(thread_lock=self._thread_lock, data_base_path=data_base_path,
+                                                     data_base_file_name=data_base_file_name)
 
     def _pprint_override(self, status, info_type: int = 1, logs: bool = False) -> None:
         """
@@ -117,198 +533,471 @@ class GitScraper(object):
 
         if self._verbose:
             self._pprints.pretty_print(current_repo=self._current_repo,
-                                       status=f"{self._info_types[info_type]}: {status}",
+                                       status=f"{self._info_types[info_type - 1]}: {status}",
                                        current_repo_id=str(self._current_repo_id),
-                                       current_token=f"Current: {self._json_handler.current_token}, "
-                                                     f"ToTal: {self._json_handler.total_values}",
+                                       current_token="Current: %d, ToTal: %d" % (self._json_handler.current_token,
+                                                                                 self._json_handler.total_values),
                                        logs=logs)
 
-    def py_class_parser(self, file_content: str) -> list:
+    def _set_token(self, git_token: str, git_instance: Github = None) -> None:
+        """
+        Switches this instance, its Github client and its search session to another token.
+
+        Args:
+            git_token (str): The GitHub token to use.
+            git_instance (Github, optional): An existing client for the token. Defaults to a new Github client.
+        """
+
+        self._git_token: str = git_token
+        self._git_instance: Github = git_instance if git_instance is not None else create_github_instance(git_token)
+        self._session.headers["Authorization"] = f"token {git_token}"
+
+    def _stop_thread(self, status: str, info_type: int = 2, with_traceback: bool = False) -> None:
+        """
+        Logs why this instance stops, once, and sets break_thread so its loops end.
+
+        Args:
+            status (str): The reason to log.
+            info_type (int, optional): The type of information (INFO, WARNING, ERROR). Defaults to 2.
+            with_traceback (bool, optional): Whether to append the traceback of the exception being handled.
+                                             Defaults to False.
+        """
+
+        # Downloads running in the fetch pool can fail together, only the first one is logged
+        if not self.break_thread.is_set():
+            self.break_thread.set()
+            if with_traceback:
+                # Formatting walks the whole stack, only pay for it when the message is actually logged
+                status = f"{status} {format_exc()}"
+            self._pprint_override(status=status, logs=True, info_type=info_type)
+
+    def _recover_rate_limit(self, headers: dict = None) -> bool:
+        """
+        Recovers from a request that hit the rate limit the way _wait_for_rate_limit() does: the token_provider
+        is asked for another token, and if there is none the thread sleeps until the reset time.
+
+        Args:
+            headers (dict, optional): The headers of the rejected response; their Retry-After or X-RateLimit-Reset
+                                      is used as the reset time instead of the one of the core rate limit.
+        Returns:
+            bool: True if the request can be retried.
+        """
+
+        headers = {key.lower(): value for key, value in (headers or {}).items()}
+        if "retry-after" in headers:
+            reset_time = time.time() + float(headers["retry-after"])
+        elif "x-ratelimit-reset" in headers:
+            reset_time = float(headers["x-ratelimit-reset"])
+        else:
+            reset_time = float(self._git_instance.rate_limiting_resettime)
+        if self._token_provider is not None:
+            next_token = self._token_provider(self._git_token, 0, reset_time)
+            if next_token != self._git_token:
+                self._pprint_override(status="Rate limit exceeded, switching token", info_type=2)
+                self._set_token(next_token)
+                return True
+
+        delay = reset_time - time.time()
+        if delay <= 0:
+            # A reset in the past means a secondary limit, retrying right away would only hit it again
+            return False
+        self._pprint_override(status="Rate limit exceeded, waiting for rate limit reset", info_type=2)
+        return not self._shutdown.wait(timeout=delay)
+
+    def _wait_for_rate_limit(self) -> None:
+        """
+        Checks the remaining core rate limit of the current token. When it is at or below the threshold the
+        token_provider is asked for another token; if none is available the thread sleeps until the reset time.
+        """
+
+        # PyGithub keeps the limit reported by the headers of the last response, reading it costs no request
+        # (only the very first check of a client fetches /rate_limit)
+        remaining, _ = self._git_instance.rate_limiting
+        if remaining > self._rate_limit_threshold:
+            return
+
+        reset_time = float(self._git_instance.rate_limiting_resettime)
+        next_token = self._git_token
+        if self._token_provider is not None:
+            next_token = self._token_provider(self._git_token, remaining, reset_time)
+
+        if next_token != self._git_token:
+            self._pprint_override(status="Token nearly exhausted, switching token", info_type=2)
+            self._set_token(next_token)
+            return
+
+        self._pprint_override(status="Token nearly exhausted, waiting for rate limit reset", info_type=2)
+        self._shutdown.wait(timeout=max(0.0, reset_time - time.time()))
+
+    def _store_file_data(self, doc_functions: list, doc_classes: list, source: str, file_content: str) -> None:
+        """
+        Hands the parsed data of a single file to the database, through the writer queue when one is set.
+        Otherwise its rows are buffered and inserted in one transaction every `db_commit_index` rows.
+
+        Args:
+            doc_functions (list): The parsed functions of the file.
+            doc_classes (list): The parsed classes of the file.
+            source (str): The source of the code snippets.
+            file_content (str): The content of the entire file.
+        """
+
+        if self._insert_queue is not None:
+            self._insert_queue.put((doc_functions, doc_classes, source, file_content))
+        else:
+            self._pending_rows.extend(self._database_handler.build_rows(functions_data=doc_functions,
+                                                                        classes_data=doc_classes,
+                                                                        source=source, file_content=file_content))
+            if len(self._pending_rows) >= self._db_commit_index:
+                self._flush_pending_rows()
+
+    def _flush_pending_rows(self) -> None:
+        """
+        Inserts the buffered rows in a single transaction, when this instance writes to the database itself.
+        """
+
+        if self._database_handler is not None and self._pending_rows:
+            self._database_handler.insert_rows(self._pending_rows)
+            self._pending_rows = []
+
+    def py_class_parser(self, file_content: str, tree: ast.Module = None) -> list:
         """
         Parses Python class definitions and their docstrings.
         Args:
             file_content (str): The content of the Python file.
+            tree (ast.Module, optional): The already parsed file. Defaults to None (parse file_content).
         Returns:
             list: A list of tuples containing formatted docstrings, class definition, and class without docstring.
         """
 
-        classes_with_docstrings = []
         try:
-            tree = ast.parse(file_content)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    if node.body and isinstance(node.body[0], ast.Expr) and isinstance(node.body[0].value, ast.Str):
-                        class_docstring = ast.unparse(node.body[0])
-                        class_without_docstring = re.sub(self._SUB_DOC_PATTERN, '', ast.unparse(node))
-                        replace_sting_to_correct_intent = [line.strip() for line in class_docstring.split("\n")]
-                        extensive_docs_strings = "\n".join(replace_sting_to_correct_intent).strip('"').strip("'")
-                        formatted_doc_string = fill(extensive_docs_strings, width=self._wrap_width, initial_indent='',
-                                                    subsequent_indent=' ' * 8).strip()
-                        classes_with_docstrings.append((formatted_doc_string,
-                                                        ast.unparse(node), class_without_docstring))
+            if tree is None:
+                tree = ast.parse(file_content)
         except SyntaxError:
             # Raise due to python-2 version code
-            ...
-        return classes_with_docstrings
+            return []
+        return _parse_definitions(tree, file_content.encode(), self._text_wrapper, (ast.ClassDef,))[1]
 
-    def py_function_parser(self, file_content: str) -> list:
+    def py_function_parser(self, file_content: str, tree: ast.Module = None) -> list:
         """
-        Parses Python function definitions and their docstrings.
+        Parses Python function definitions, including async ones, and their docstrings.
 
         Args:
             file_content (str): The content of the Python file.
+            tree (ast.Module, optional): The already parsed file. Defaults to None (parse file_content).
 
         Returns:
             list: A list of tuples containing formatted docstrings, function definition, and function without docstring.
         """
 
-        functions_with_docstrings = []
         try:
-            tree = ast.parse(file_content)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    if node.body and isinstance(node.body[0], ast.Expr) and isinstance(node.body[0].value, ast.Str):
-                        function_doc_string = ast.unparse(node.body[0])
-                        function_without_docstring = re.sub(self._SUB_DOC_PATTERN, '', ast.unparse(node))
-                        replace_sting_to_correct_intent = [line.strip() for line in function_doc_string.split("\n")]
-                        extensive_docs_strings = "\n".join(replace_sting_to_correct_intent).strip('"').strip("'")
-                        formatted_doc_string = fill(extensive_docs_strings, width=self._wrap_width, initial_indent='',
-                                                    subsequent_indent=' ' * 8).strip()
-                        functions_with_docstrings.append(
-                            (formatted_doc_string, ast.unparse(node), function_without_docstring)
-                        )
+            if tree is None:
+                tree = ast.parse(file_content)
         except SyntaxError:
             # Raise due to python-2 version code
-            ...
-        return functions_with_docstrings
+            return []
+        return _parse_definitions(tree, file_content.encode(), self._text_wrapper,
+                                  (ast.FunctionDef, ast.AsyncFunctionDef))[0]
 
-    def get_repos(self) -> list[Repository]:
+    def parse_file(self, file_content: str) -> tuple[list, list]:
         """
-        Retrieves a list of repositories based on the search query.
+        Parses a Python file once and extracts both its documented functions and classes from the same tree.
+
+        Args:
+            file_content (str): The content of the Python file.
+
         Returns:
-            list[Repository]: A Repository list of repositories.
+            tuple[list, list]: The parsed functions and the parsed classes, as returned by py_function_parser
+                               and py_class_parser.
         """
 
-        try:
-            # start_page: int = int((len(self._json_handler.id_record) / 30) + 1)
-            search_repos = self._json_handler.current_git_instance.search_repositories(
-                self._search_query
-            )
-            # search_repos = search_repos.get_page(start_page)
-        except Timeout:
-            traceback_text = format_exc()
-            self._pprint_override(status=f"Look Like no internet connection Error: {traceback_text}", logs=True,
-                                  info_type=3)
-            sys.exit()
-        except RateLimitExceededException:
-            sys.exit()
-        return search_repos
+        if not _may_have_docstrings(file_content):
+            # Not worth shipping to the pool, the file would not be parsed there either
+            return [], []
+        if self._parse_pool is not None:
+            future = None
+            try:
+                future = self._parse_pool.submit(parse_python_file, file_content, self._wrap_width)
+                # The worker thread only waits here, other workers keep downloading while processes parse
+                return future.result(timeout=self._PARSE_TIMEOUT)
+            except (BrokenExecutor, FutureTimeoutError) as error:
+                if future is not None:
+                    future.cancel()
+                # A dead or hanging pool, e.g. a main module without a __main__ guard, is not used again
+                self._parse_pool = None
+                self._pprint_override(status=f"Parse pool failed ({type(error).__name__}), parsing in this thread",
+                                      info_type=2)
+            except RuntimeError:
+                if not self._shutdown.is_set():
+                    raise
+                # The pool was shut down while stopping
+        return parse_python_file(file_content, self._wrap_width)
+
+    @_net_guard
+    def _get_search_page(self, page: int):
+        """
+        Requests a page of the repository search through the keep-alive session.
+        Args:
+            page (int): The page number, starting at 1.
+        Returns:
+            Response: The response of the search API, None if the request failed.
+        Raises:
+            RateLimitExceededException: The search hit the primary or a secondary rate limit.
+        """
+
+        response = self._session.get(self._SEARCH_URL, timeout=self._REQUEST_TIMEOUT,
+                                     params={"q": self._search_query, "page": page, "per_page": self._SEARCH_PAGE_SIZE})
+        if response.status_code in (403, 429) and (response.headers.get("X-RateLimit-Remaining") == "0"
+                                                   or "Retry-After" in response.headers):
+            # Handed to _net_guard, which switches token or waits like for any other rate-limited request
+            raise RateLimitExceededException(response.status_code, None, dict(response.headers))
+        if response.status_code != 422:
+            # GitHub answers 422 past the first 1000 search results, get_repos() stops there
+            response.raise_for_status()
+        return response
+
+    def get_repos(self) -> Iterator[dict]:
+        """
+        Retrieves the repositories matching the search query, page by page through a keep-alive session.
+        The JSON is parsed directly and the repositories are yielded as their raw data, so whichever instance
+        scrapes one binds it to its own client (and token) with _bind_repo().
+        Returns:
+            Iterator[dict]: The raw data of the repositories that were not scraped yet.
+        """
 
+        page = 1
+        while True:
+            response = self._get_search_page(page)
+            if response is None or response.status_code == 422:
+                # GitHub only serves the first 1000 search results
+                return
+
+            items = json_loads(response.content)["items"]
+            for item in items:
+                if not self._json_handler.contains(item["id"]):
+                    yield item
+            if len(items) < self._SEARCH_PAGE_SIZE:
+                return
+            page += 1
+
+    @_net_guard
     def get_single_repo(self, repo_name) -> PaginatedList:
         """
         Retrieves a single repository by name or ID.
         Args:
             repo_name: The name or ID of the repository.
         Returns:
-            PaginatedList: A paginated list containing the specified repository.
+            PaginatedList: A paginated list containing the specified repository, None if the request failed.
         """
 
-        try:
-            repo = self._json_handler.current_git_instance.get_repo(full_name_or_id=repo_name)
-        except Timeout:
-            traceback_text = format_exc()
-            self._pprint_override(status=f"Look Like no internet connection Error: {traceback_text}", logs=True,
-                                  info_type=3)
-            sys.exit()
-        except RateLimitExceededException:
-            sys.exit()
-        return repo
+        return self._git_instance.get_repo(full_name_or_id=repo_name)
 
-    def get_sub_dirs(self, raw_contents, repo, branch) -> list:
+    @_net_guard
+    def get_python_content_files(self, repo, branch) -> list:
         """
-        Retrieves subdirectories within a repository.
-
+        Retrieves Python content files within a repository from its recursive git tree, one request for the
+        whole repository instead of one per directory.
         Args:
-            raw_contents: The raw contents of the repository.
             repo: The GitHub repository.
             branch: The default branch of the repository.
+        Returns:
+            list: The tree entries of the Python content files within the repository, None if the request failed.
+        """
+
+        # Bound per request, so a retry after a token switch goes out with the new token
+        tree = self._bind_repo(repo).get_git_tree(sha=branch, recursive=True)
+
+        if tree.raw_data.get("truncated"):
+            self._pprint_override(status=f"Tree of {repo.name} is truncated by GitHub, scraping the listed files only",
+                                  logs=True, info_type=2)
+
+        # Hidden directories (.git, .github, .tox ...) are skipped at any depth, setup scripts at the root and
+        # files too large to be parsed are not even downloaded
+        return [entry for entry in tree.tree
+                if entry.type == "blob" and entry.path.endswith(".py") and not entry.path.startswith("setup")
+                and "/." not in "/" + entry.path.rpartition("/")[0] and entry.size <= _MAX_FILE_SIZE]
 
+    @_net_guard
+    def get_file_content(self, repo, file) -> str:
+        """
+        Retrieves the content of a file.
+        Args:
+            repo: The GitHub repository holding the file.
+            file: The tree entry of the file.
         Returns:
-            list: A list of subdirectories within the repository.
+            str: The content of the file, None if the request failed.
         """
+        blob = self._bind_repo(repo).get_git_blob(file.sha)
+        # Some files are not UTF-8 (latin-1 sources and the like), keep them rather than failing the repository
+        return b64decode(blob.content).decode("utf-8", errors="replace")
+
+    def _bind_repo(self, repo) -> Repository:
+        """
+        Builds the Repository object on this instance's current client. PyGithub objects keep the client that
+        created them, so a repository found by another instance would otherwise be scraped with its token.
 
-        sub_dirs = []
-        queue = raw_contents.copy()
-        while queue:
-            current_directory = queue.pop(0)
-            if current_directory.type == "dir" and not current_directory.path.startswith("."):
-                sub_dirs.append(current_directory)
-                try:
-                    new_contents = repo.get_contents(path=current_directory.path, ref=branch)
-                except Timeout:
-                    traceback_text = format_exc()
-                    self._pprint_override(status=f"Look Like no internet connection Error: {traceback_text}", logs=True,
-                                          info_type=3)
-                    sys.exit()
-                except RateLimitExceededException:
-                    sys.exit()
-                queue.extend(new_contents)
-        return sub_dirs
-
-    def get_python_content_files(self, raw_contents, repo, branch, sub_dirs) -> list:
-        """
-        Retrieves Python content files within a repository.
         Args:
-            raw_contents: The raw contents of the repository.
-            repo: The GitHub repository.
-            branch: The default branch of the repository.
-            sub_dirs: A list of subdirectories within the repository.
+            repo: The repository, as raw data or as a Repository of any client.
         Returns:
-            list: A list of Python content files within the repository.
+            Repository: The repository bound to the current client.
         """
 
-        contents = []
-        # Getting Content for raw_contents
-        for content in raw_contents:
-            if content.path.endswith(".py") and not content.path.startswith("setup"):
-                contents.append(content)
+        raw_data = repo.raw_data if isinstance(repo, Repository) else repo
+        return self._git_instance.create_from_raw_data(Repository, raw_data)
 
-        # Loop through all the sub_dirs for their content
-        for directory in sub_dirs:
-            try:
-                directory_contents = repo.get_contents(path=directory.path, ref=branch)
-            except Timeout:
-                traceback_text = format_exc()
-                self._pprint_override(status=f"Look Like no internet connection Error: {traceback_text}", logs=True,
-                                      info_type=3)
-                sys.exit()
-            except RateLimitExceededException:
-                sys.exit()
-
-            for content in directory_contents:
-                if content.path.endswith(".py") and not content.path.startswith("setup"):
-                    contents.append(content)
-        return contents
-
-    def get_file_content(self, file) -> str:
+    def _fetch_file_contents(self, repo, contents_files: list, futures: deque) -> Iterator:
         """
-        Retrieves the content of a file.
+        Downloads the files on the fetch_pool with at most fetch_window downloads in flight, submitting the next
+        one as each result is consumed.
+
+        Args:
+            repo (Repository): The repository the files belong to.
+            contents_files (list): The files to download.
+            futures (deque): Holds the downloads in flight; the caller cancels whatever is left in it.
+
+        Yields:
+            str | None: The content of each file, in order.
+        """
+
+        for content_file in contents_files:
+            futures.append(self._fetch_pool.submit(self.get_file_content, repo, content_file))
+            if len(futures) >= self._fetch_window:
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+
+    def process_repo(self, repo) -> bool:
+        """
+        Scrapes a single repository: lists its Python files, downloads and parses them and hands the
+        parsed data to the database.
+
         Args:
-            file: The file object.
+            repo: The repository to scrape, as raw data or as a Repository.
         Returns:
-            str: The content of the file.
+            bool: False if the scraping was cut short by a shutdown, a timeout or the rate limit.
         """
+
+        self._wait_for_rate_limit()
+        if self._shutdown.is_set():
+            return False
+
+        # Bound after the rate limit check, which may have switched this instance to another token
+        repo = self._bind_repo(repo)
+
+        source = repo.html_url
+        branch = repo.default_branch
+        self._current_repo = repo.name
+        self._current_repo_id = repo.id
+        self._pprint_override(status="Getting content_files")
+        contents_files = self.get_python_content_files(repo, branch)
+        if contents_files is None or self._shutdown.is_set():
+            return False
+        self._pprint_override(status="Getting files data and storing in database")
+        futures = deque()
+        if self._fetch_pool is not None:
+            file_contents = self._fetch_file_contents(repo, contents_files, futures)
+        else:
+            file_contents = map(partial(self.get_file_content, repo), contents_files)
         try:
-            file_content = file.decoded_content.decode("utf-8")
-        except Timeout:
-            traceback_text = format_exc()
-            self._pprint_override(status=f"Look Like no internet connection Error: {traceback_text}", logs=True,
-                                  info_type=3)
-            sys.exit()
+            for file_content in file_contents:
+                if file_content is None or self._shutdown.is_set():
+                    return False
+                # Forks and vendored copies repeat the same files across repositories, only store each file once
+                file_hash = blake2b(file_content.encode(), digest_size=16).digest()
+                if file_hash in self._seen_file_hashes:
+                    continue
+                self._seen_file_hashes.add(file_hash)
+                doc_functions, doc_classes = self.parse_file(file_content)
+                if doc_functions or doc_classes:
+                    self._store_file_data(doc_functions=doc_functions, doc_classes=doc_classes,
+                                          source=source, file_content=file_content)
+        finally:
+            # Leaving early (shutdown, rate limit) drops the downloads that did not start yet
+            for future in futures:
+                future.cancel()
+        return True
+
+    def _scrape_repo(self, repo) -> None:
+        """
+        Scrapes a repository with process_repo() and records its ID once it is done. An error in one repository
+        (a missing tree, a file the parse pool fails on) is logged and the repository is recorded all the same;
+        only an exceeded rate limit is raised. A repository cut short is not recorded, so it is scraped again.
+
+        Args:
+            repo (dict): The raw data of the repository to scrape.
+        """
+
+        try:
+            finished = self.process_repo(repo)
         except RateLimitExceededException:
-            sys.exit()
+            self._queued_ids.discard(repo["id"])
+            raise
+        except Exception:
+            self._pprint_override(status=f"Skipping repository after an error: {format_exc()}", info_type=3,
+                                  logs=True)
+            finished = True
+        if finished:
+            self._json_handler.insertion_in_record_ids(new_id=repo["id"])
+        else:
+            # Let the pager of the next batch queue it again
+            self._queued_ids.discard(repo["id"])
+
+    def produce_repos(self, repo_queue: Queue, consumers: int, stop_event: Event) -> None:
+        """
+        Pages through the search results and puts the raw data of every repository that was not scraped or
+        queued yet on the queue. The IDs are only recorded as scraped by the worker that scrapes the repository,
+        so the repositories still queued when the run stops are scraped by the next run.
+        When paging ends, for whatever reason, one `None` per consumer is queued so the consumers stop.
+
+        Args:
+            repo_queue (Queue): The bounded queue feeding the consumers.
+            consumers (int): The number of consumers reading the queue.
+            stop_event (Event): Set by the supervisor once the consumers are gone; unblocks a full queue.
+        """
+
+        def put(item) -> bool:
+            while not (self._shutdown.is_set() or stop_event.is_set()):
+                try:
+                    repo_queue.put(item, timeout=1)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        try:
+            self._pprint_override(status="Getting REPOS")
+            repos: Iterator[dict] = self.get_repos()
+            for repo in repos:
+                if repo["id"] in self._queued_ids or self._json_handler.contains(repo["id"]):
+                    continue
+                self._queued_ids.add(repo["id"])
+                if not put(repo):
+                    return
+        finally:
+            for _ in range(consumers):
+                if not put(None):
+                    break
+
+    def consume_repos(self, repo_queue: Queue) -> None:
+        """
+        Scrapes the repositories put on the queue by produce_repos until a `None` is received or the
+        instance is stopped.
+
+        Args:
+            repo_queue (Queue): The queue fed by produce_repos.
+        """
 
-        return file_content
+        try:
+            while not (self._shutdown.is_set() or self.break_thread.is_set()):
+                try:
+                    # produce_repos queues no end marker once shutdown is set, so never block on the queue for good
+                    repo = repo_queue.get(timeout=1)
+                except Empty:
+                    continue
+                if repo is None:
+                    return
+                self._scrape_repo(repo)
+        finally:
+            self._json_handler.dump_json()
 
     def search_loop(self) -> None:
         """
@@ -316,45 +1005,18 @@ class GitScraper(object):
         """
 
         self._pprint_override(status="Getting REPOS")
-        repos: list[Repository] = self.get_repos()
-        # current_db_commit_index = 0
-        for repo in repos:
-            if self.break_thread.is_set():
-                break
-            if repo.id in self._json_handler.id_record:
-                time.sleep(1)
-                continue
-            self._json_handler.insertion_in_record_ids(new_id=repo.id)
-
-            source = repo.html_url
-            branch = repo.default_branch
-            self._current_repo = repo.name
-            self._current_repo_id = repo.id
-            self._pprint_override(status="Getting raw_contents")
-            try:
-                with self._thread_lock:
-                    raw_contents = repo.get_contents(ref=branch, path="")
-            except RateLimitExceededException:
-                sys.exit()
-
-            self._pprint_override(status="Getting sub_dirs")
-            sub_dirs = self.get_sub_dirs(raw_contents, repo, branch)
-            self._pprint_override(status="Getting content_files")
-            contents_files = self.get_python_content_files(raw_contents, repo, branch, sub_dirs)
-            self._pprint_override(status="Getting files data and storing in database")
-            for content_file in contents_files:
-                if self.break_thread.is_set():
-                    break
-                file_content = self.get_file_content(content_file)
-                doc_functions = self.py_function_parser(file_content)
-                doc_classes = self.py_class_parser(file_content)
-                if doc_functions or doc_classes:
-                    self._database_handler.insert_data(functions_data=doc_functions,
-                                                       classes_data=doc_classes,
-                                                       source=source,
-                                                       file_content=file_content)
+        repos: Iterator[dict] = self.get_repos()
+        try:
+            for repo in repos:
+                if self._shutdown.is_set() or self.break_thread.is_set():
+                    return
+                if self._json_handler.contains(repo["id"]):
+                    time.sleep(1)
+                    continue
+                self._scrape_repo(repo)
+        finally:
+            self._flush_pending_rows()
             self._json_handler.dump_json()
-            # current_db_commit_index += 1
 
     def single_loop(self) -> None:
         """
@@ -362,25 +1024,9 @@ class GitScraper(object):
         """
         self._pprint_override(status="Getting REPO")
         repo = self.get_single_repo("Anonym0usWork1221/android-memorytool")
-        branch = repo.default_branch
-        source = repo.html_url
-        self._current_repo = repo.name
-        self._current_repo_id = repo.id
-        self._pprint_override(status="Getting raw_contents")
-        raw_contents = repo.get_contents(ref=branch, path="")
-        self._pprint_override(status="Getting sub_dirs")
-        sub_dirs = self.get_sub_dirs(raw_contents, repo, branch)
-        self._pprint_override(status="Getting content_files")
-        contents_files = self.get_python_content_files(raw_contents, repo, branch, sub_dirs)
-        self._pprint_override(status="Getting files data and storing in database")
-        for content_file in contents_files:
-            if self.break_thread.is_set():
-                break
-            file_content = self.get_file_content(content_file)
-            doc_functions = self.py_function_parser(file_content)
-            doc_classes = self.py_class_parser(file_content)
-            if doc_functions or doc_classes:
-                self._database_handler.insert_data(functions_data=doc_functions,
-                                                   classes_data=doc_classes, source=source,
-                                                   file_content=file_content)
-
+        if repo is None:
+            return
+        try:
+            self.process_repo(repo)
+        finally:
+            self._flush_pending_rows()
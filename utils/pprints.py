@@ -1,26 +1,39 @@
 from platform import system as system_platform
-from threading import active_count, Lock
+from queue import Queue, Full, Empty
+from threading import active_count, Thread
 from psutil import Process
-from os.path import isfile
 from os import system
+import atexit
+import sys
 
 
 class PPrints:
     """
     This class handles pretty-printing status messages and provides terminal-related functionalities.
 
+    Status messages are only handed over by the calling threads, a background logger thread renders them, so
+    scraping never waits on the terminal or the log file. The terminal is redrawn at most once per render_interval
+    with the newest status; messages to log are queued so none of them is skipped.
+
     Args:
-    - print_lock (Lock): A thread lock for printing synchronization.
+    - queue_size (int): The maximum number of pending log messages, newer messages are dropped when it is full.
+    - render_interval (float): Seconds the logger thread waits between two renders.
 
     Attributes:
     - HEADER, BLUE, CYAN, GREEN, WARNING, RED, RESET: ANSI escape codes for text formatting.
     - _process: A Process instance for accessing memory information.
-    - _print_lock: A lock for printing synchronization.
+    - _platform: The platform name, looked up once.
+    - _template: The format template of the colored status screen.
     - _log_file: The name of the log file for storing status messages.
+    - _log_fp: The log file, opened once in append mode and written by the logger thread only.
+    - _latest_status: The newest status message, redrawn by the logger thread when it changed.
+    - _log_queue: The bounded queue of messages to log feeding the logger thread.
+    - _logger: The background thread rendering the queued messages.
 
     Methods:
-    - clean_terminal(): Clears the terminal screen based on the platform.
-    - pretty_print(current_repo, status, current_repo_id, logs): Prints formatted status messages.
+    - clean_terminal(): Clears the terminal screen with an ANSI escape sequence.
+    - pretty_print(current_repo, status, current_repo_id, logs): Hands a status message to the logger thread.
+    - close(): Renders the pending messages, stops the logger thread and closes the log file.
     """
 
     HEADER = '\033[95m'
@@ -30,39 +43,63 @@ class PPrints:
     WARNING = '\033[93m'
     RED = '\033[91m'
     RESET = '\033[0m'
+    CLEAR = '\033[2J\033[H'
 
-    def __init__(self, print_lock: Lock = Lock()) -> None:
+    def __init__(self, queue_size: int = 10000, render_interval: float = 0.1) -> None:
         """
-        Initializes a new instance of the PPrints class.
+        Initializes a new instance of the PPrints class and starts its logger thread.
 
         Args:
-            print_lock (Lock, optional): A thread lock for printing synchronization. Defaults to Lock().
+            queue_size (int, optional): The maximum number of pending log messages. Defaults to 10000.
+            render_interval (float, optional): Seconds between two renders. Defaults to 0.1.
         """
 
         self._process = Process()
-        self._print_lock = print_lock
+        self._platform = system_platform()
+        if self._platform == "Windows":
+            # Enables ANSI escape sequences in the Windows console, which clean_terminal relies on
+            system("")
         self._log_file = "logs.txt"
-
-    @staticmethod
-    def clean_terminal() -> str:
+        # Line buffered, so every batch of log lines reaches the file without reopening it per batch
+        self._log_fp = open(self._log_file, "a", buffering=1)
+        atexit.register(self._log_fp.close)
+        self._render_interval = render_interval
+        self._latest_status = None
+        # Everything but the status fields is fixed, so the colored screen is formatted from one template
+        self._template = (f"{self.CLEAR}"
+                          f"{self.GREEN}Platform: {self._platform}\n"
+                          f"{self.CYAN}Developer: AbdulMoez\n"
+                          f"{self.GREEN}Scraper Version: 0.1\n"
+                          f"{self.WARNING}GitHub: github.com/Anonym0usWork1221\n"
+                          f"{self.BLUE}Current Repo: {{current_repo}}\n"
+                          f"{self.CYAN}Current Repo ID: {{current_repo_id}}\n"
+                          f"{self.GREEN}Token: {{current_token}}\n"
+                          f"{self.WARNING}Status: {{status}}\n"
+                          f"{self.GREEN}Output File: Sqlite3\n"
+                          f"{self.BLUE}Launched Multi Threads: {{threads}}\n"
+                          f"{self.WARNING}MemoryUsageByScript: {{memory_usage: .2f}}MB\n"
+                          f"{self.RED}Warning: Don't open the output file while script is running\n{self.RESET}\n")
+        self._log_queue: Queue = Queue(maxsize=queue_size)
+        self._logger = Thread(target=self._logger_loop, name="PPrintsLogger", daemon=True)
+        self._logger.start()
+
+    def clean_terminal(self) -> str:
         """
-        Clears the terminal screen based on the platform.
+        Clears the terminal screen with an ANSI escape sequence instead of starting a cls/clear shell.
         Returns:
             str: The platform name.
         """
 
-        if system_platform() == "Windows":
-            system("cls")
-        else:
-            system("clear")
-        return system_platform()
+        sys.stdout.write(self.CLEAR)
+        return self._platform
 
     def pretty_print(self, current_repo: str, status: str,
                      current_repo_id: str = "Calculating .....",
                      current_token: str = "Calculating...",
                      logs: bool = False) -> None:
         """
-        Prints formatted status messages.
+        Hands a status message to the logger thread. Only the newest status is kept for the next redraw, messages
+        to log are queued and dropped only if the queue is full.
         Args:
             current_repo (str): The name of the current repository.
             status (str): The status message to be printed.
@@ -71,36 +108,79 @@ class PPrints:
             logs (bool, optional): Whether to include detailed logs. Defaults to False.
         """
 
-        with self._print_lock:
-            memory_info = self._process.memory_info()
-            current_memory_usage = memory_info.rss / 1024 / 1024  # Convert bytes to megabytes
-            non_log_msg = f"Current Repo: {current_repo}\n" \
-                          f"Status: {status}\n" \
-                          f"Current Repo: {current_repo}\n" \
-                          f"Token: {current_token}\n" \
-                          f"Current Repo ID: {current_repo_id}\n"
-
-            log_msg = f"{self.GREEN}Platform: {self.clean_terminal()}\n" \
-                      f"{self.CYAN}Developer: AbdulMoez\n" \
-                      f"{self.GREEN}Scraper Version: 0.1\n" \
-                      f"{self.WARNING}GitHub: github.com/Anonym0usWork1221\n" \
-                      f"{self.BLUE}Current Repo: {current_repo}\n" \
-                      f"{self.CYAN}Current Repo ID: {current_repo_id}\n" \
-                      f"{self.GREEN}Token: {current_token}\n" \
-                      f"{self.WARNING}Status: {status}\n" \
-                      f"{self.GREEN}Output File: Sqlite3\n" \
-                      f"{self.BLUE}Launched Multi Threads: {active_count() - 1}\n" \
-                      f"{self.WARNING}MemoryUsageByScript: {current_memory_usage: .2f}MB\n" \
-                      f"{self.RED}Warning: Don't open the output file while script is running\n{self.RESET}"
-            print(log_msg)
-            if logs:
-                if isfile(self._log_file):
-                    file_obj = open(self._log_file, "a")
-                    file_obj.write(non_log_msg)
-                    file_obj.close()
-                else:
-                    file_obj = open(self._log_file, "w")
-                    file_obj.write(non_log_msg)
-                    file_obj.close()
+        message = (current_repo, status, current_repo_id, current_token)
+        # A single assignment, the logger thread picks up whichever status is the newest when it redraws
+        self._latest_status = message
+        if logs:
+            try:
+                self._log_queue.put_nowait(message)
+            except Full:
+                pass
+
+    def close(self) -> None:
+        """
+        Renders the pending status messages, stops the logger thread and closes the log file.
+        """
+
+        if self._logger.is_alive():
+            # The logger drains everything queued before the marker, so block rather than drop it
+            self._log_queue.put(None)
+            self._logger.join()
+        self._log_fp.close()
+
+    def _logger_loop(self) -> None:
+        """
+        Every render_interval drains the queue, appends the logged messages to the log file and redraws the
+        terminal once with the latest status if it changed.
+        """
+
+        rendered_status = None
+        running = True
+        while running:
+            messages = []
+            try:
+                messages.append(self._log_queue.get(timeout=self._render_interval))
+            except Empty:
+                pass
+            while True:
+                try:
+                    messages.append(self._log_queue.get_nowait())
+                except Empty:
+                    break
+            if None in messages:
+                running = False
+                messages = [message for message in messages if message is not None]
+
+            if messages:
+                self._log_fp.write("".join(self._non_log_msg(*message) for message in messages))
+
+            # Only the newest status is visible after the terminal is cleared, older ones would just flicker
+            latest_status = self._latest_status
+            if latest_status is not None and latest_status is not rendered_status:
+                rendered_status = latest_status
+                sys.stdout.write(self._log_msg(*latest_status))
+                sys.stdout.flush()
+
+    @staticmethod
+    def _non_log_msg(current_repo: str, status: str, current_repo_id: str, current_token: str) -> str:
+        """
+        Formats a status message for the log file.
+        Returns:
+            str: The plain status message.
+        """
+
+        return "".join(("Current Repo: ", current_repo, "\nStatus: ", status, "\nToken: ", current_token,
+                        "\nCurrent Repo ID: ", current_repo_id, "\n"))
 
+    def _log_msg(self, current_repo: str, status: str, current_repo_id: str, current_token: str) -> str:
+        """
+        Formats a status message for the terminal, starting with the sequence that clears it.
+        Returns:
+            str: The colored status message.
+        """
 
+        memory_info = self._process.memory_info()
+        current_memory_usage = memory_info.rss / 1024 / 1024  # Convert bytes to megabytes
+        return self._template.format(current_repo=current_repo, current_repo_id=current_repo_id,
+                                     current_token=current_token, status=status, threads=active_count() - 2,
+                                     memory_usage=current_memory_usage)